@@ -9,10 +9,190 @@ st.set_page_config(
 )
 
 import subprocess
+import sys
 import os
+import html
+import time
+from collections import deque
+from pathlib import Path
 from pages.manage_posts import show_manage_posts
 from pages.invoice_generator import show_invoice_generator
 from pages.edit_post import show_edit_post
+from utils.backends import ROOT_DIR
+from utils.job_queue import get_job_queue
+from utils.database import get_db
+from utils.depth_profiles import get_run_history
+
+# How often the job list re-renders while the page is open; output arriving in
+# between is batched into one update
+JOB_REFRESH_SECONDS = 1.0
+# Lines kept in each job's live view; the complete output is in the job's log file
+LIVE_LOG_LINES = 300
+# How much of a finished job's log file is read to fill its view
+LOG_TAIL_BYTES = 64 * 1024
+JOB_LIST_LIMIT = 20
+# Workers started by the page stop after this long without a job
+WORKER_IDLE_EXIT_SECONDS = 600
+# Don't start another worker while one started this recently is still warming up
+WORKER_START_GRACE_SECONDS = 30
+STATUS_ICONS = {"queued": "⏳", "running": "🏃", "completed": "✅", "failed": "❌"}
+
+class LogTail:
+    """Ring buffer of the most recent lines of a log, fed with chunks that may split lines
+
+    Rendering it costs the same however long the generation runs, unlike
+    re-joining the whole output on every update.
+    """
+
+    def __init__(self, max_lines=LIVE_LOG_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.partial = ""
+        # Whether earlier lines are missing from the view
+        self.truncated = False
+
+    def feed(self, text):
+        *complete, self.partial = (self.partial + text).split("\n")
+        for line in complete:
+            if len(self.lines) == self.lines.maxlen:
+                self.truncated = True
+            self.lines.append(line)
+
+    def text(self):
+        return "\n".join([*self.lines, self.partial])
+
+def render_terminal(placeholder, text, css_class="terminal"):
+    placeholder.markdown(f'<div class="{css_class}">{html.escape(text)}</div>', unsafe_allow_html=True)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_log(path, modified):
+    """A finished job's complete log, cached until the file changes"""
+    return Path(path).read_bytes()
+
+def read_log_tail(path):
+    """The last LOG_TAIL_BYTES of a log file as a LogTail"""
+    tail = LogTail()
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - LOG_TAIL_BYTES))
+        data = f.read().decode("utf-8", errors="replace")
+    if size > LOG_TAIL_BYTES:
+        # Drop the line the read started in the middle of
+        data = data.split("\n", 1)[-1]
+        tail.truncated = True
+    tail.feed(data)
+    return tail
+
+def ensure_worker(queue):
+    """Start a background worker if none is consuming the queue
+
+    The worker runs detached from the Streamlit script, so generations keep
+    going across reruns and tab reloads and the script never blocks on one.
+    """
+    if queue.active_workers():
+        return
+    if time.time() - st.session_state.get("worker_started_at", 0) < WORKER_START_GRACE_SECONDS:
+        return
+    log_path = ROOT_DIR / ".cache" / "worker.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, "run_worker.py", "--idle-exit", str(WORKER_IDLE_EXIT_SECONDS)],
+            cwd=ROOT_DIR,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+            env={**os.environ, "ANTHROPIC_API_KEY": st.secrets["ANTHROPIC_API_KEY"], "PYTHONUNBUFFERED": "1"}
+        )
+    st.session_state["worker_started_at"] = time.time()
+
+def job_timing(job):
+    """How long a job has waited, run, or took"""
+    now = time.time()
+    if job["status"] == "queued":
+        return f"waiting {now - job['created_at']:.0f}s"
+    if job["status"] == "running":
+        return f"running {now - job['started_at']:.0f}s"
+    if job["started_at"] and job["finished_at"]:
+        return f"took {job['finished_at'] - job['started_at']:.0f}s"
+    return job["status"]
+
+def job_output(queue, job):
+    """The recent lines of a job's output, fetching only events newer than this session has seen
+
+    A finished job this session didn't follow is read from the end of its log file
+    instead of replaying all of its events.
+    """
+    logs = st.session_state.setdefault("job_logs", {})
+    log = logs.get(job["id"])
+    if log is None:
+        log_path = job.get("log_path")
+        if job["status"] in ("completed", "failed") and log_path and os.path.exists(log_path):
+            log = {"event_id": job["log_offset"], "tail": read_log_tail(log_path)}
+        else:
+            log = {"event_id": 0, "tail": LogTail()}
+        logs[job["id"]] = log
+    if job["log_offset"] > log["event_id"]:
+        for event in queue.events(job["id"], log["event_id"]):
+            log["event_id"] = event["id"]
+            if event["kind"] == "output":
+                log["tail"].feed(event["text"])
+    return log["tail"]
+
+def show_job_log(queue, job, in_progress):
+    """A job's live view, plus where to get the complete log"""
+    tail = job_output(queue, job)
+    log_path = job.get("log_path")
+    if tail.truncated:
+        location = f" · full log: `{log_path}`" if log_path and in_progress else ""
+        st.caption(f"Showing the most recent {len(tail.lines)} lines{location}")
+    render_terminal(st.empty(), tail.text(), css_class="terminal job-terminal")
+    if not in_progress and log_path and os.path.exists(log_path):
+        st.download_button(
+            "⬇️ Download full log",
+            data=read_log(log_path, os.path.getmtime(log_path)),
+            file_name=f"{job['id']}.log",
+            mime="text/plain",
+            key=f"download-log-{job['id']}"
+        )
+
+@st.fragment(run_every=JOB_REFRESH_SECONDS)
+def show_jobs():
+    """Every recent generation with its live output, re-rendered on a timer
+
+    Only this fragment reruns, and each rerun is one query for the job list plus
+    one per job with new output, so any number of jobs can be followed at once.
+    """
+    queue = get_job_queue()
+    jobs = queue.list_jobs(limit=JOB_LIST_LIMIT)
+    if not jobs:
+        return
+    workers = queue.active_workers()
+    # A worker that died mid-job stops heartbeating; put its jobs back on the queue
+    # and start a replacement rather than showing them as running forever
+    worker_ids = {worker["id"] for worker in workers}
+    if any(job["status"] == "running" and job["worker_id"] not in worker_ids for job in jobs):
+        if queue.requeue_abandoned():
+            jobs = queue.list_jobs(limit=JOB_LIST_LIMIT)
+    if any(job["status"] == "queued" for job in jobs):
+        ensure_worker(queue)
+    active = [job for job in jobs if job["status"] in ("queued", "running")]
+    st.subheader("Generations")
+    st.caption(f"👷 {len(workers)} worker{'s' if len(workers) != 1 else ''} running · "
+               f"{len(active)} in progress · run `python run_worker.py` again to run more at once")
+    for job in jobs:
+        in_progress = job in active
+        icon = STATUS_ICONS.get(job["status"], "•")
+        with st.expander(f"{icon} {job['topic']} · {job['analysis_depth']} · {job_timing(job)}", expanded=in_progress):
+            if job["status"] == "queued":
+                st.caption(f"⏳ Queued behind {queue.queue_position(job['id'])} other generations")
+            elif job["status"] == "completed":
+                st.success(f"✅ Saved as draft {job['post_id']}")
+            elif job["status"] == "failed":
+                st.error(f"❌ {job['error']}")
+            # Finished logs are loaded on request so old jobs don't slow every refresh
+            if in_progress or st.toggle("Show output", key=f"show-output-{job['id']}"):
+                show_job_log(queue, job, in_progress)
 
 # Custom CSS
 st.markdown("""
@@ -43,6 +223,10 @@ st.markdown("""
         overflow-y: auto;
         white-space: pre-wrap;
     }
+    .job-terminal {
+        min-height: 0;
+        max-height: 600px;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -81,6 +265,30 @@ if page == "Blog Generator":
             help="Choose how deep you want the analysis to be"
         )
 
+    # What the chosen depth runs, and what it has measured on past generations
+    st.caption(get_run_history().describe(analysis_depth))
+
+    # Warn before spending a generation on a topic that's already been written up
+    similar_posts = []
+    if topic:
+        try:
+            similar_posts = get_db().find_similar_posts(topic)
+        except Exception as e:
+            st.caption(f"Couldn't check for similar posts: {str(e)}")
+    generate_anyway = False
+    if similar_posts:
+        st.warning("⚠️ This topic looks close to existing posts:\n" + "\n".join(
+            f"- **{match.title}** ({match.score:.0%} similar, {'published' if match.published else 'draft'})"
+            for match in similar_posts
+        ))
+        generate_anyway = st.checkbox("Generate anyway", value=False)
+
+    fresh_search = st.checkbox(
+        "Fresh search results",
+        value=False,
+        help="Skip cached web searches from earlier generations and search again"
+    )
+
     # Info box about the process
     with st.expander("ℹ️ How it works", expanded=False):
         st.markdown("""
@@ -96,46 +304,20 @@ if page == "Blog Generator":
     if st.button("✨ Generate Blog Post", help="Click to start generating your blog post"):
         if not topic:
             st.error("Please enter a topic first!")
+        elif similar_posts and not generate_anyway:
+            st.error("This topic is already covered. Tick 'Generate anyway' to write it again.")
         else:
             try:
-                # Make the shell script executable
-                script_path = os.path.join(os.path.dirname(__file__), "run.sh")
-                os.chmod(script_path, 0o755)
-                
-                # Create a placeholder for output
-                output_placeholder = st.empty()
-                
-                # Run the shell script with topic and analysis depth
-                process = subprocess.Popen(
-                    [script_path, topic, analysis_depth, st.secrets["ANTHROPIC_API_KEY"]],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                    bufsize=1
-                )
-                
-                # Initialize output lines list
-                output_lines = []
-                
-                # Read and display output in real-time
-                for line in process.stdout:
-                    output_lines.append(line)
-                    output_placeholder.markdown(
-                        f'<div class="terminal">{"".join(output_lines)}</div>',
-                        unsafe_allow_html=True
-                    )
-                
-                # Wait for the process to complete
-                process.wait()
-                
-                if process.returncode == 0:
-                    st.success("✅ Blog post generated and saved as draft!")
-                else:
-                    st.error("❌ An error occurred during generation")
-                    
+                # The job runs on a background worker; its progress shows in the list below
+                queue = get_job_queue()
+                queue.enqueue(topic, analysis_depth, {"fresh_search": fresh_search})
+                ensure_worker(queue)
+                st.toast(f"✨ Queued: {topic}")
             except Exception as e:
                 st.error(f"❌ An error occurred: {str(e)}")
 
+    show_jobs()
+
 elif page == "Manage Posts":
     show_manage_posts()
 elif page == "Edit Post":
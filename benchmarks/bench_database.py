@@ -0,0 +1,175 @@
+"""Benchmarks for the hot DatabaseClient paths against a recording fake Supabase
+
+Run from the repo root:
+
+    python -m benchmarks.bench_database
+    python -m benchmarks.bench_database --sizes 100 1000 --rtt-ms 20
+    python -m benchmarks.bench_database --baseline benchmarks/baseline.json
+
+Results are written as JSON (benchmarks/results/latest.json by default). With
+--baseline the run fails if any operation makes more round trips than the baseline.
+"""
+import sys
+import json
+import time
+import uuid
+import argparse
+import platform
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.fake_supabase import FakeSupabaseClient, TransportRecorder
+from utils.backends import SQLiteBackend, ROOT_DIR
+from utils.database import DatabaseClient, MediaContent, POST_SUMMARY_COLUMNS
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_ITERATIONS = 20
+# Whole-table reads move the entire corpus per call, so they get fewer iterations
+FULL_LIST_ITERATIONS = 3
+
+def load_template_posts(csv_path: Path = ROOT_DIR / "posts_rows.csv") -> List[Dict]:
+    """Read posts_rows.csv through the SQLite loader so rows come back in the backend's shape"""
+    template = SQLiteBackend()
+    template.load_csv(csv_path)
+    return template.list_posts()
+
+def generate_corpus(size: int, templates: List[Dict]) -> List[Dict]:
+    """Build `size` posts cycling through the templates, with unique ids and spread-out timestamps"""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    posts = []
+    for i in range(size):
+        post = dict(templates[i % len(templates)])
+        created = (start + timedelta(minutes=i)).isoformat()
+        post.update({
+            "id": str(uuid.uuid4()),
+            "title": f"{post['title']} #{i}",
+            "date": created,
+            "created_at": created,
+            "updated_at": created,
+            "published": i % 3 != 0,
+            "thumbnail_url": f"http://fake-supabase.local/storage/v1/object/public/posts/posts/thumb-{i}.png" if i % 2 else None,
+        })
+        posts.append(post)
+    return posts
+
+def make_client(posts: List[Dict], rtt_ms: float, with_append_rpc: bool = True):
+    fake = FakeSupabaseClient(TransportRecorder(rtt_ms), with_append_rpc=with_append_rpc)
+    fake.tables["posts"] = [dict(post) for post in posts]
+    fake.buckets["posts"] = {
+        f"posts/{post['thumbnail_url'].split('/')[-1]}": b"png" for post in posts if post.get("thumbnail_url")
+    }
+    return fake, DatabaseClient(client=fake)
+
+def run_operation(name: str, db: DatabaseClient, recorder: TransportRecorder,
+                  operation: Callable[[int], None], iterations: int, size: int) -> Dict:
+    """Time one operation cold (cache cleared before every call) and collect its traffic"""
+    latencies = []
+    recorder.reset()
+    for i in range(iterations):
+        db.cache.clear()
+        started = time.perf_counter()
+        operation(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+    totals = recorder.totals()
+    latencies.sort()
+    return {
+        "corpus_size": size,
+        "operation": name,
+        "iterations": iterations,
+        "round_trips_per_op": totals["round_trips"] / iterations,
+        "bytes_sent_per_op": round(totals["bytes_sent"] / iterations),
+        "bytes_received_per_op": round(totals["bytes_received"] / iterations),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p50": round(latencies[len(latencies) // 2], 3),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        },
+    }
+
+def run_size(size: int, templates: List[Dict], iterations: int, rtt_ms: float) -> List[Dict]:
+    posts = generate_corpus(size, templates)
+    ids = [post["id"] for post in posts]
+    with_thumbnails = [post["id"] for post in posts if post.get("thumbnail_url")]
+    fake, db = make_client(posts, rtt_ms)
+    media = MediaContent(type="image", url="http://fake-supabase.local/a.png", caption="bench")
+
+    operations = [
+        ("list_full", lambda i: db.get_blog_posts(), min(iterations, FULL_LIST_ITERATIONS)),
+        ("list_summaries", lambda i: db.get_blog_posts(columns=POST_SUMMARY_COLUMNS), min(iterations, FULL_LIST_ITERATIONS)),
+        ("list_page", lambda i: db.get_blog_posts_page(page_size=25), iterations),
+        ("count", lambda i: db.count_blog_posts(), iterations),
+        ("get_post", lambda i: db.get_blog_post(ids[i % size]), iterations),
+        ("update", lambda i: db.update_blog_post(ids[i % size], {"title": f"Updated {i}"}), iterations),
+        ("toggle_publish", lambda i: db.toggle_publish_status(ids[i % size], i % 2 == 0), iterations),
+        ("add_media", lambda i: db.add_media_to_post(ids[i % size], media), iterations),
+        ("delete_with_thumbnail", lambda i: db.delete_post(with_thumbnails[i]), min(iterations, len(with_thumbnails))),
+    ]
+    results = [run_operation(name, db, fake.recorder, operation, count, size) for name, operation, count in operations]
+
+    # Projects that haven't installed append_post_media take the read + conditional write path
+    fake, db = make_client(posts, rtt_ms, with_append_rpc=False)
+    results.append(run_operation(
+        "add_media_without_rpc", db, fake.recorder,
+        lambda i: db.add_media_to_post(ids[i % size], media), iterations, size
+    ))
+    return results
+
+def compare_to_baseline(results: List[Dict], baseline_path: Path) -> List[str]:
+    """List every operation whose round trips per call went up compared to the baseline"""
+    baseline = {
+        (entry["corpus_size"], entry["operation"]): entry
+        for entry in json.loads(baseline_path.read_text())["results"]
+    }
+    regressions = []
+    for entry in results:
+        previous = baseline.get((entry["corpus_size"], entry["operation"]))
+        if previous and entry["round_trips_per_op"] > previous["round_trips_per_op"]:
+            regressions.append(
+                f"{entry['operation']} @ {entry['corpus_size']}: "
+                f"{previous['round_trips_per_op']} -> {entry['round_trips_per_op']} round trips"
+            )
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseClient against a fake Supabase")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated round-trip time per request")
+    parser.add_argument("--output", type=Path, default=ROOT_DIR / "benchmarks" / "results" / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="Fail if round trips exceed this results file")
+    args = parser.parse_args(argv)
+
+    templates = load_template_posts()
+    results = []
+    for size in args.sizes:
+        print(f"📊 Corpus of {size} posts", flush=True)
+        for entry in run_size(size, templates, args.iterations, args.rtt_ms):
+            results.append(entry)
+            print(f"   {entry['operation']:<24} {entry['round_trips_per_op']:>5.2f} trips  "
+                  f"{entry['bytes_sent_per_op']:>9} B sent  {entry['bytes_received_per_op']:>11} B recv  "
+                  f"{entry['latency_ms']['mean']:>9.3f} ms", flush=True)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "rtt_ms": args.rtt_ms,
+        "iterations": args.iterations,
+        "results": results,
+    }, indent=2))
+    print(f"✅ Results written to {args.output}", flush=True)
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline)
+        if regressions:
+            print("❌ Round-trip regressions:", flush=True)
+            for line in regressions:
+                print(f"   {line}", flush=True)
+            return 1
+        print("✅ No round-trip regressions against the baseline", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
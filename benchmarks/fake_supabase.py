@@ -0,0 +1,338 @@
+import re
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from pydantic import BaseModel
+
+class RequestRecord(BaseModel):
+    """One simulated HTTP round trip"""
+    method: str
+    path: str
+    bytes_sent: int
+    bytes_received: int
+    seconds: float
+
+class TransportRecorder:
+    """Counts the round trips, bytes and latency of every request made through a fake client"""
+
+    def __init__(self, rtt_ms: float = 0.0):
+        """
+        Args:
+            rtt_ms: Simulated network round-trip time added to every request
+        """
+        self.rtt_ms = rtt_ms
+        self.requests: List[RequestRecord] = []
+
+    def record(self, method: str, path: str, body: Any, response: Any, started: float):
+        if self.rtt_ms:
+            time.sleep(self.rtt_ms / 1000)
+        sent = len(method) + len(path) + (len(_dumps(body)) if body is not None else 0)
+        self.requests.append(RequestRecord(
+            method=method,
+            path=path,
+            bytes_sent=sent,
+            bytes_received=len(_dumps(response)) if response is not None else 0,
+            seconds=time.perf_counter() - started
+        ))
+
+    def reset(self):
+        self.requests = []
+
+    def totals(self) -> Dict[str, Any]:
+        return {
+            "round_trips": len(self.requests),
+            "bytes_sent": sum(request.bytes_sent for request in self.requests),
+            "bytes_received": sum(request.bytes_received for request in self.requests),
+        }
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str).encode("utf-8")
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+class FakeAPIError(Exception):
+    """Stands in for postgrest.exceptions.APIError; str() carries the PostgREST error code"""
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a PostgREST logic expression on commas outside parentheses and quotes"""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+}
+
+def _coerce(row_value: Any, text: str) -> Any:
+    """Turn a filter value from the URL into something comparable with the row value"""
+    if isinstance(row_value, bool):
+        return text.lower() == "true"
+    if isinstance(row_value, (int, float)):
+        return type(row_value)(text)
+    return text
+
+def _parse_logic(expression: str):
+    """Compile an or=(...) expression into a row predicate"""
+    terms = []
+    for part in _split_top_level(expression):
+        match = re.fullmatch(r"(and|or)\((.*)\)", part, re.S)
+        if match:
+            inner = _parse_logic(match.group(2))
+            terms.append(inner if match.group(1) == "or" else _all_of(inner.terms))
+            continue
+        column, operator, value = part.split(".", 2)
+        value = value[1:-1] if value.startswith('"') and value.endswith('"') else value
+        terms.append(_filter(column, operator, value))
+    return _any_of(terms)
+
+def _filter(column, operator, value):
+    def predicate(row):
+        return _OPERATORS[operator](row.get(column), _coerce(row.get(column), str(value)))
+    return predicate
+
+def _any_of(terms):
+    predicate = lambda row: any(term(row) for term in terms)
+    predicate.terms = terms
+    return predicate
+
+def _all_of(terms):
+    predicate = lambda row: all(term(row) for term in terms)
+    predicate.terms = terms
+    return predicate
+
+class FakeQuery:
+    """Mirrors the postgrest-py request builder closely enough for SupabaseBackend"""
+
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self.client = client
+        self.table_name = table
+        self.method = "GET"
+        self.body = None
+        self.columns = "*"
+        self.count = None
+        self.head = False
+        self.filters = []
+        self.params = []
+        self.orders = []
+        self.row_limit = None
+
+    def select(self, columns="*", count=None, head=False):
+        self.columns, self.count, self.head = columns, count, head
+        self.params.append(("select", columns))
+        return self
+
+    def insert(self, rows):
+        self.method, self.body = "POST", rows
+        return self
+
+    def update(self, values):
+        self.method, self.body = "PATCH", values
+        return self
+
+    def delete(self):
+        self.method = "DELETE"
+        return self
+
+    def eq(self, column, value):
+        self.params.append((column, f"eq.{value}"))
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.params.append((column, f"in.({','.join(str(value) for value in values)})"))
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        self.params.append(("or", f"({expression})"))
+        self.filters.append(_parse_logic(expression))
+        return self
+
+    def order(self, column, desc=False):
+        self.params.append(("order", f"{column}.{'desc' if desc else 'asc'}"))
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.params.append(("limit", str(count)))
+        self.row_limit = count
+        return self
+
+    def _path(self) -> str:
+        query = "&".join(f"{key}={quote(str(value), safe='.,()*')}" for key, value in self.params)
+        return f"/rest/v1/{self.table_name}" + (f"?{query}" if query else "")
+
+    def _project(self, row: Dict) -> Dict:
+        if self.columns == "*":
+            return dict(row)
+        return {column: row.get(column) for column in self.columns.split(",")}
+
+    def execute(self) -> FakeResponse:
+        started = time.perf_counter()
+        rows = self.client.tables.setdefault(self.table_name, [])
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+
+        if self.method == "GET":
+            for column, desc in reversed(self.orders):
+                matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            if self.row_limit is not None:
+                matched = matched[:self.row_limit]
+            response = FakeResponse([] if self.head else [self._project(row) for row in matched],
+                                    count=len(matched) if self.count else None)
+        elif self.method == "POST":
+            created = [self.client.new_row(values) for values in self.body]
+            rows.extend(created)
+            response = FakeResponse([dict(row) for row in created])
+        elif self.method == "PATCH":
+            for row in matched:
+                row.update(self.body)
+            response = FakeResponse([dict(row) for row in matched])
+        else:
+            ids = {id(row) for row in matched}
+            rows[:] = [row for row in rows if id(row) not in ids]
+            response = FakeResponse([dict(row) for row in matched])
+
+        self.client.recorder.record(self.method, self._path(), self.body, response.data, started)
+        return response
+
+class FakeRPC:
+    def __init__(self, client: "FakeSupabaseClient", name: str, params: Dict):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> FakeResponse:
+        started = time.perf_counter()
+        handler = self.client.functions.get(self.name)
+        if handler is None:
+            error = {"code": "PGRST202", "message": f"Could not find the function public.{self.name}"}
+            self.client.recorder.record("POST", f"/rest/v1/rpc/{self.name}", self.params, error, started)
+            raise FakeAPIError(str(error))
+        response = FakeResponse(handler(self.client, **self.params))
+        self.client.recorder.record("POST", f"/rest/v1/rpc/{self.name}", self.params, response.data, started)
+        return response
+
+def append_post_media(client: "FakeSupabaseClient", post_id: str, new_media: List[Dict]) -> List[Dict]:
+    """Same effect as the append_post_media SQL function in docs/setup.md"""
+    for row in client.tables.get("posts", []):
+        if row["id"] == post_id:
+            row["media"] = (row.get("media") or []) + new_media
+            row["updated_at"] = datetime.now(timezone.utc).isoformat()
+            return [dict(row)]
+    return []
+
+class FakeBucket:
+    def __init__(self, client: "FakeSupabaseClient", bucket: str):
+        self.client = client
+        self.bucket = bucket
+        self.files = client.buckets.setdefault(bucket, {})
+
+    def upload(self, path, file, file_options=None):
+        started = time.perf_counter()
+        data = file if isinstance(file, bytes) else file.read()
+        self.files[path] = data
+        response = {"Key": f"{self.bucket}/{path}"}
+        self.client.recorder.record("POST", f"/storage/v1/object/{self.bucket}/{path}", None, response, started)
+        self.client.recorder.requests[-1].bytes_sent += len(data)
+        return response
+
+    def remove(self, paths):
+        started = time.perf_counter()
+        removed = [{"name": path} for path in paths if self.files.pop(path, None) is not None]
+        self.client.recorder.record("DELETE", f"/storage/v1/object/{self.bucket}", {"prefixes": paths}, removed, started)
+        return removed
+
+    def list(self, folder=None, options=None):
+        started = time.perf_counter()
+        prefix = f"{folder}/" if folder else ""
+        names = [{"name": path[len(prefix):]} for path in self.files if path.startswith(prefix)]
+        names = names[:(options or {}).get("limit", 100)]
+        self.client.recorder.record("POST", f"/storage/v1/object/list/{self.bucket}", {"prefix": folder}, names, started)
+        return names
+
+    def get_public_url(self, path):
+        # Built locally by storage3, no request
+        return f"{self.client.url}/storage/v1/object/public/{self.bucket}/{path}"
+
+    def create_signed_url(self, path, expires_in):
+        started = time.perf_counter()
+        response = {"signedURL": f"{self.client.url}/storage/v1/object/sign/{self.bucket}/{path}?token=fake"}
+        self.client.recorder.record("POST", f"/storage/v1/object/sign/{self.bucket}/{path}",
+                                    {"expiresIn": expires_in}, response, started)
+        return response
+
+class FakeStorage:
+    def __init__(self, client: "FakeSupabaseClient"):
+        self.client = client
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self.client, bucket)
+
+class FakeSupabaseClient:
+    """In-process stand-in for a Supabase client: PostgREST tables, RPC functions and storage
+
+    Every execute() (and every storage call that hits the network in supabase-py)
+    counts as one round trip on the recorder, with the URL and JSON body counted as
+    bytes sent and the JSON response as bytes received.
+    """
+
+    def __init__(self, recorder: Optional[TransportRecorder] = None, with_append_rpc: bool = True):
+        """
+        Args:
+            recorder: Where to record requests. Defaults to a new recorder with no added latency.
+            with_append_rpc: Whether the append_post_media function is "installed"
+        """
+        self.url = "http://fake-supabase.local"
+        self.recorder = recorder or TransportRecorder()
+        self.tables: Dict[str, List[Dict]] = {}
+        self.buckets: Dict[str, Dict[str, bytes]] = {}
+        self.functions = {"append_post_media": append_post_media} if with_append_rpc else {}
+        self.storage = FakeStorage(self)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict) -> FakeRPC:
+        return FakeRPC(self, name, params)
+
+    @staticmethod
+    def new_row(values: Dict) -> Dict:
+        """Fill in the column defaults Postgres would"""
+        now = datetime.now(timezone.utc).isoformat()
+        row = {
+            "id": str(uuid.uuid4()),
+            "tags": [],
+            "media": [],
+            "published": False,
+            "thumbnail_url": None,
+            "thumbnail": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        row.update(values)
+        return row
@@ -1,15 +1,36 @@
 import streamlit as st
 import os
 from datetime import datetime
-from utils.database import db
+from utils.database import db, ConcurrentUpdateError
+
+PAGE_SIZE = 50
 
 def show_edit_post():
     st.title("✏️ Edit Post")
     
-    # Get list of posts for selection using existing method
-    posts = db.get_blog_posts()
+    # Page through post titles; the full post is only fetched once selected
+    if "edit_cursors" not in st.session_state:
+        st.session_state.edit_cursors = [None]
+    cursors = st.session_state.edit_cursors
+    posts, next_cursor = db.get_blog_posts_page(
+        columns=["id", "title"],
+        page_size=PAGE_SIZE,
+        cursor=cursors[-1]
+    )
     post_titles = {post['id']: post['title'] for post in posts}
     
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", key="edit_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.write(f"Page {len(cursors)}")
+    with col_next:
+        if st.button("Next ➡️", key="edit_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    
     # Post selection
     selected_post_id = st.selectbox(
         "Select Post to Edit",
@@ -20,6 +41,12 @@ def show_edit_post():
     if selected_post_id:
         post = db.get_blog_post(selected_post_id)
         
+        # Remember which version of the post the form was opened on, so saving
+        # fails instead of overwriting someone else's edits made in the meantime
+        if st.session_state.get("edit_loaded_id") != selected_post_id:
+            st.session_state.edit_loaded_id = selected_post_id
+            st.session_state.edit_loaded_updated_at = post.get('updated_at')
+        
         with st.form("edit_post_form"):
             # Basic post info
             title = st.text_input("Title", value=post['title'])
@@ -68,14 +95,24 @@ def show_edit_post():
                     updates['thumbnail'] = f"{selected_post_id}{file_ext}"
                 
                 # Update post using existing method
-                updated_post = db.update_blog_post(selected_post_id, updates)
+                updated_post = db.update_blog_post(
+                    selected_post_id,
+                    updates,
+                    if_updated_at=st.session_state.edit_loaded_updated_at
+                )
                 
                 if updated_post:
+                    st.session_state.edit_loaded_updated_at = updated_post.get('updated_at')
                     st.success("Post updated successfully!")
                     st.rerun()
                 else:
                     st.error("Failed to update post")
                     
+            except ConcurrentUpdateError:
+                # Forget the stale version so the next rerun loads the latest post
+                st.session_state.pop("edit_loaded_id", None)
+                st.error("This post was changed by someone else since you opened it. "
+                         "Reload the page to see the latest version before saving again.")
             except Exception as e:
                 st.error(f"Error updating post: {str(e)}")
 
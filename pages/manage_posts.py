@@ -1,119 +1,192 @@
 import streamlit as st
 import pandas as pd
 import json
+import time
 from datetime import datetime
-from utils.database import DatabaseClient
+from utils.database import get_db, POST_SUMMARY_COLUMNS
+from utils.async_database import get_sync_async_db
 
-# Initialize database client with Supabase credentials from Streamlit secrets
-db = DatabaseClient(
-    url=st.secrets["SUPABASE_URL"],
-    key=st.secrets["SUPABASE_KEY"]
-)
+# Shared database client; connects lazily on the first query
+db = get_db()
+
+PAGE_SIZE = 25
+
+def _format_date(value):
+    """Format an ISO timestamp from Supabase for display"""
+    value = (value or '').replace('Z', '+00:00')
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+def _get_page(published):
+    """Fetch the current page of post summaries for a tab, keeping the cursor stack in session state"""
+    key = f"manage_cursors_{'published' if published else 'drafts'}"
+    if key not in st.session_state:
+        st.session_state[key] = [None]
+    cursors = st.session_state[key]
+    
+    posts, next_cursor = db.get_blog_posts_page(
+        columns=POST_SUMMARY_COLUMNS,
+        published=published,
+        page_size=PAGE_SIZE,
+        cursor=cursors[-1]
+    )
+    return posts, next_cursor, cursors
+
+def _show_pager(cursors, next_cursor, key_prefix):
+    """Show previous/next buttons for a keyset-paginated list"""
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", key=f"{key_prefix}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.write(f"Page {len(cursors)}")
+    with col_next:
+        if st.button("Next ➡️", key=f"{key_prefix}_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+def _show_post(post, publish, snippet=None):
+    """Show a post summary with a publish/unpublish button; content is only fetched on demand"""
+    with st.expander(f"📝 {post['title']}"):
+        # Show where a search matched
+        if snippet:
+            st.markdown(f"> {snippet}")
+        
+        # Display post metadata
+        st.write(f"**Description:** {post['description']}")
+        st.write(f"**Type:** {post['type']}")
+        if post.get('tags'):
+            st.write(f"**Tags:** {', '.join(post['tags'])}")
+        
+        # Handle dates safely
+        if post.get('created_at'):
+            st.write(f"**Created:** {_format_date(post['created_at'])}")
+        if post.get('updated_at'):
+            st.write(f"**Last Updated:** {_format_date(post['updated_at'])}")
+        
+        # Display thumbnail if available
+        if post.get('thumbnail'):
+            st.image(post['thumbnail'], caption="Thumbnail", width=200)
+        
+        # Load the full post only when the user asks for the content
+        if st.toggle("Show content", key=f"content_{post['id']}"):
+            full_post = db.get_blog_post(post['id'])
+            if full_post and full_post.get('content'):
+                st.markdown("### Content Preview")
+                st.markdown(full_post['content'])
+        
+        label = "Publish" if publish else "Unpublish"
+        if st.button(label, key=f"{'pub' if publish else 'unpub'}_{post['id']}"):
+            try:
+                db.toggle_publish_status(post['id'], publish)
+                st.success(f"Post {label.lower()}ed successfully!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error {label.lower()}ing post: {str(e)}")
+
+def _show_bulk_actions(posts, publish, key_prefix):
+    """Show a multi-select that publishes/unpublishes the chosen posts in one request, or deletes them"""
+    if not posts:
+        return
+    titles = {post['id']: post['title'] for post in posts}
+    label = "Publish" if publish else "Unpublish"
+    selected = st.multiselect(
+        f"Select posts to {label.lower()} or delete",
+        options=list(titles.keys()),
+        format_func=lambda post_id: titles[post_id],
+        key=f"{key_prefix}_bulk_select"
+    )
+    col_publish, col_delete = st.columns(2)
+    with col_publish:
+        if st.button(f"{label} selected ({len(selected)})", key=f"{key_prefix}_bulk", disabled=not selected):
+            try:
+                db.bulk_set_published(selected, publish)
+                st.success(f"{len(selected)} posts {label.lower()}ed successfully!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error {label.lower()}ing posts: {str(e)}")
+    with col_delete:
+        confirmed = st.checkbox("Confirm delete", key=f"{key_prefix}_bulk_delete_confirm", disabled=not selected)
+        if st.button(f"🗑️ Delete selected ({len(selected)})", key=f"{key_prefix}_bulk_delete",
+                     disabled=not (selected and confirmed)):
+            try:
+                # Each delete is a row delete plus a thumbnail removal; run them concurrently
+                deleted = get_sync_async_db().delete_posts(selected)
+                st.success(f"{sum(deleted)} posts deleted successfully!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error deleting posts: {str(e)}")
+
+def _show_search():
+    """Show the full-text search box; returns True while a search is active"""
+    col_query, col_tags, col_status = st.columns([3, 2, 1])
+    with col_query:
+        query = st.text_input("🔍 Search posts", placeholder="Search titles, descriptions and content")
+    with col_tags:
+        tags = st.multiselect("Tags", options=db.get_search_tags())
+    with col_status:
+        status = st.selectbox("Status", ["All", "Published", "Drafts"])
+    
+    if not query:
+        return False
+    
+    published = {"All": None, "Published": True, "Drafts": False}[status]
+    started = time.perf_counter()
+    results = db.search_posts(query, tags=tags, published=published, limit=50)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    st.caption(f"{len(results)} results in {elapsed_ms:.1f} ms")
+    for post in results:
+        _show_post(post, publish=not post['published'], snippet=post.get('snippet'))
+    return True
 
 def show_manage_posts():
     """Show the manage posts interface"""
     st.title("Manage Blog Posts")
     
     try:
-        # Fetch all posts
-        response = db.client.table("posts").select("*").order('created_at', desc=True).execute()
-        posts = response.data
+        if _show_search():
+            return
         
-        # Debug: Show total posts
-        st.write(f"Total posts found: {len(posts)}")
-        
-        # Debug: Show each post's published status
-        with st.expander("🔍 Debug: Post Status"):
-            for post in posts:
-                st.write(f"Post '{post['title']}' - Published value: {post.get('published')} (Type: {type(post.get('published'))})")
-        
-        # Separate posts based on published status - using boolean conversion
-        published_posts = [post for post in posts if bool(post.get('published'))]
-        draft_posts = [post for post in posts if not bool(post.get('published'))]
+        # Count posts on the server instead of downloading them
+        published_count = db.count_blog_posts(published=True)
+        draft_count = db.count_blog_posts(published=False)
         
         # Debug: Show counts
-        st.write(f"Published posts found: {len(published_posts)}")
-        st.write(f"Draft posts found: {len(draft_posts)}")
+        st.write(f"Total posts found: {published_count + draft_count}")
+        st.write(f"Published posts found: {published_count}")
+        st.write(f"Draft posts found: {draft_count}")
+        with st.expander("🔌 Connection status"):
+            if st.button("Check connection"):
+                st.json(db.get_status())
+        
+        cache_stats = db.get_cache_stats()
+        st.caption(
+            f"Post cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['entries']} entries)"
+        )
         
         # Create tabs for published and draft posts
         tab_published, tab_drafts = st.tabs([
-            f"Published Posts ({len(published_posts)})", 
-            f"Draft Posts ({len(draft_posts)})"
+            f"Published Posts ({published_count})", 
+            f"Draft Posts ({draft_count})"
         ])
         
         # Display published posts
         with tab_published:
-            for post in published_posts:
-                with st.expander(f"📝 {post['title']}"):
-                    # Display post metadata
-                    st.write(f"**Description:** {post['description']}")
-                    st.write(f"**Type:** {post['type']}")
-                    if post.get('tags'):
-                        st.write(f"**Tags:** {', '.join(post['tags'])}")
-                    
-                    # Handle dates safely
-                    created_at = post.get('created_at', '').replace('Z', '+00:00')
-                    updated_at = post.get('updated_at', '').replace('Z', '+00:00')
-                    
-                    if created_at:
-                        st.write(f"**Created:** {datetime.fromisoformat(created_at).strftime('%Y-%m-%d %H:%M:%S')}")
-                    if updated_at:
-                        st.write(f"**Last Updated:** {datetime.fromisoformat(updated_at).strftime('%Y-%m-%d %H:%M:%S')}")
-                    
-                    # Display thumbnail if available
-                    if post.get('thumbnail'):
-                        st.image(post['thumbnail'], caption="Thumbnail", width=200)
-                    
-                    # Display content
-                    if post.get('content'):
-                        st.markdown("### Content Preview")
-                        st.markdown(post['content'])
-                    
-                    # Add unpublish button
-                    if st.button(f"Unpublish", key=f"unpub_{post['id']}"):
-                        try:
-                            db.toggle_publish_status(post['id'], False)
-                            st.success("Post unpublished successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error unpublishing post: {str(e)}")
+            posts, next_cursor, cursors = _get_page(published=True)
+            _show_bulk_actions(posts, publish=False, key_prefix="published")
+            for post in posts:
+                _show_post(post, publish=False)
+            _show_pager(cursors, next_cursor, "published")
         
         # Display draft posts
         with tab_drafts:
-            for post in draft_posts:
-                with st.expander(f"📝 {post['title']}"):
-                    # Display post metadata
-                    st.write(f"**Description:** {post['description']}")
-                    st.write(f"**Type:** {post['type']}")
-                    if post.get('tags'):
-                        st.write(f"**Tags:** {', '.join(post['tags'])}")
-                    
-                    # Handle dates safely
-                    created_at = post.get('created_at', '').replace('Z', '+00:00')
-                    updated_at = post.get('updated_at', '').replace('Z', '+00:00')
-                    
-                    if created_at:
-                        st.write(f"**Created:** {datetime.fromisoformat(created_at).strftime('%Y-%m-%d %H:%M:%S')}")
-                    if updated_at:
-                        st.write(f"**Last Updated:** {datetime.fromisoformat(updated_at).strftime('%Y-%m-%d %H:%M:%S')}")
-                    
-                    # Display thumbnail if available
-                    if post.get('thumbnail'):
-                        st.image(post['thumbnail'], caption="Thumbnail", width=200)
-                    
-                    # Display content
-                    if post.get('content'):
-                        st.markdown("### Content Preview")
-                        st.markdown(post['content'])
-                    
-                    # Add publish button
-                    if st.button(f"Publish", key=f"pub_{post['id']}"):
-                        try:
-                            db.toggle_publish_status(post['id'], True)
-                            st.success("Post published successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error publishing post: {str(e)}")
+            posts, next_cursor, cursors = _get_page(published=False)
+            _show_bulk_actions(posts, publish=True, key_prefix="drafts")
+            for post in posts:
+                _show_post(post, publish=True)
+            _show_pager(cursors, next_cursor, "drafts")
                     
     except Exception as e:
         st.error(f"Error loading posts: {str(e)}")
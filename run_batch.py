@@ -0,0 +1,116 @@
+import sys
+import time
+import argparse
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+
+from utils.backends import ROOT_DIR, get_setting
+
+DEFAULT_WORKERS = 3
+
+def read_topics(path):
+    """Read one topic per line, skipping blank lines and # comments"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+def generate(topic, analysis_depth, api_key, log_path):
+    """Run one generation in a worker process, logging its output to its own file
+
+    The post is saved as a draft by run_workflow as soon as it finishes.
+
+    Returns:
+        Dict with the topic, saved post ID (None on failure), seconds taken, error and log path
+    """
+    from run_workflow import run_workflow
+
+    started = time.perf_counter()
+    error = None
+    post_id = None
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            saved_post = run_workflow(topic, analysis_depth, api_key)
+            if saved_post:
+                post_id = saved_post.get("id")
+            else:
+                error = "Post was not saved"
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Generation failed: {error}", flush=True)
+    return {
+        "topic": topic,
+        "post_id": post_id,
+        "seconds": time.perf_counter() - started,
+        "error": error,
+        "log": str(log_path),
+    }
+
+def run_batch(topics, analysis_depth, api_key, workers=DEFAULT_WORKERS):
+    """Generate a post per topic on a bounded process pool and print a summary
+
+    LLM calls across all workers share the BLOG_LLM_RATE_LIMIT_PER_MINUTE limit.
+
+    Returns:
+        List of per-topic result dicts in completion order
+    """
+    log_dir = ROOT_DIR / "runs" / f"batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    print(f"🚀 Generating {len(topics)} posts with {workers} workers (logs in {log_dir})", flush=True)
+
+    started = time.perf_counter()
+    results = []
+    # Spawned rather than forked so workers don't inherit open SQLite connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(generate, topic, analysis_depth, api_key, log_dir / f"{index:03d}.log"): topic
+            for index, topic in enumerate(topics, 1)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {"topic": futures[future], "post_id": None, "seconds": 0.0, "error": str(e), "log": None}
+            results.append(result)
+            mark = "✅" if result["post_id"] else "❌"
+            detail = f"saved {result['post_id']}" if result["post_id"] else result["error"]
+            print(f"{mark} [{len(results)}/{len(topics)}] {result['topic']} ({result['seconds']:.0f}s): {detail}", flush=True)
+
+    elapsed = time.perf_counter() - started
+    succeeded = [result for result in results if result["post_id"]]
+    failed = [result for result in results if not result["post_id"]]
+    durations = sorted(result["seconds"] for result in succeeded)
+
+    print("\n📊 Batch summary", flush=True)
+    print(f"   Posts saved: {len(succeeded)}/{len(results)}   Failed: {len(failed)}", flush=True)
+    print(f"   Wall clock: {elapsed / 60:.1f} min   Throughput: {len(succeeded) / elapsed * 3600:.1f} posts/hour", flush=True)
+    if durations:
+        print(f"   Per post: mean {statistics.mean(durations):.0f}s, "
+              f"median {statistics.median(durations):.0f}s, max {durations[-1]:.0f}s", flush=True)
+    for result in failed:
+        print(f"   ❌ {result['topic']}: {result['error']} (log: {result['log']})", flush=True)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate draft posts for every topic in a file")
+    parser.add_argument("topics_file", help="Text file with one topic per line")
+    parser.add_argument("analysis_depth", choices=["Basic", "Detailed", "Comprehensive"])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Generations running at once")
+    args = parser.parse_args()
+
+    # Read from the environment/secrets rather than argv so the key doesn't show up in ps
+    api_key = get_setting("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("ANTHROPIC_API_KEY must be set in the environment or .streamlit/secrets.toml")
+        sys.exit(1)
+
+    topics = read_topics(args.topics_file)
+    if not topics:
+        print(f"No topics found in {args.topics_file}")
+        sys.exit(1)
+
+    results = run_batch(topics, args.analysis_depth, api_key, workers=args.workers)
+    sys.exit(0 if all(result["post_id"] for result in results) else 1)
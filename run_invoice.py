@@ -5,6 +5,7 @@ from anthropic import Anthropic
 import streamlit as st
 from utils.pdf_generator import generate_invoice
 from tools.calculator import CalculatorTool
+from utils.llm_cache import cached_messages_create, get_llm_cache
 import sys
 import re
 
@@ -53,8 +54,9 @@ Return ONLY a valid JSON array of entries. Each entry must have:
 - rate (${hourly_rate})
 - amount (hours * rate)"""
 
-    # Get processed entries from Claude
-    response = client.messages.create(
+    # Get processed entries from Claude; the same timesheet and rate reuse the cached response
+    response = cached_messages_create(
+        client,
         model="claude-3-5-sonnet-20241022",
         max_tokens=2000,
         temperature=0,
@@ -62,6 +64,7 @@ Return ONLY a valid JSON array of entries. Each entry must have:
         messages=[{"role": "user", "content": prompt}]
     )
     
+    status.write(get_llm_cache().summary())
     progress.progress(40)
     
     try:
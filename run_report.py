@@ -0,0 +1,19 @@
+import json
+import argparse
+
+from utils.checkpoints import runs_dir
+from utils.telemetry import load_events, summarize, format_report
+
+def run_report(last=None, as_json=False):
+    """Aggregate stage telemetry from runs/*/events.jsonl and print where time and tokens go"""
+    summary = summarize(load_events(runs_dir(), last=last))
+    print(json.dumps(summary, indent=2) if as_json else format_report(summary), flush=True)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize per-stage latency and token use across generation runs")
+    parser.add_argument("--last", type=int, help="Only the most recent N runs")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    run_report(last=args.last, as_json=args.json)
@@ -0,0 +1,26 @@
+import argparse
+from utils.backends import SupabaseBackend
+from utils.sync import PostReplicaSync, get_replica
+
+def run_sync(full_id_check=False):
+    """Pull changes from Supabase into the local replica and print what moved"""
+    replica = get_replica()
+    syncer = PostReplicaSync(SupabaseBackend(), replica)
+
+    print(f"🔄 Syncing posts into {replica.path} (watermark: {syncer.get_watermark() or 'none'})", flush=True)
+    report = syncer.sync(full_id_check=full_id_check)
+
+    print(f"✅ Fetched {report.rows_fetched} changed rows in {report.requests} requests "
+          f"({report.bytes_transferred / 1024:.1f} KB, {report.seconds:.2f}s)", flush=True)
+    print(f"   Upserted: {report.rows_upserted}  Deleted: {report.rows_deleted}  "
+          f"Id check: {'yes' if report.full_id_check else 'no'}", flush=True)
+    print(f"   New watermark: {report.watermark}", flush=True)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pull post changes from Supabase into the local replica")
+    parser.add_argument("--full", action="store_true",
+                        help="Also diff ids against Supabase to drop posts deleted upstream")
+    args = parser.parse_args()
+
+    run_sync(full_id_check=args.full)
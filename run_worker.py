@@ -0,0 +1,175 @@
+import io
+import os
+import sys
+import time
+import uuid
+import argparse
+import threading
+from pathlib import Path
+from typing import Optional
+from contextlib import redirect_stdout, redirect_stderr
+
+from utils.backends import get_setting
+from utils.checkpoints import RunCheckpoint
+from utils.job_queue import JobQueue, get_job_queue
+
+POLL_INTERVAL = 0.5
+HEARTBEAT_INTERVAL = 5.0
+# How often buffered job output is published as an event
+OUTPUT_FLUSH_INTERVAL = 0.2
+
+class JobOutput(io.TextIOBase):
+    """File-like stdout replacement that publishes a job's output as queue events
+
+    Writes are buffered and published every OUTPUT_FLUSH_INTERVAL seconds by a
+    background thread, so streamed tokens arrive promptly without one event per token.
+    Everything is also appended to the job's log file, the complete record the
+    page offers for download.
+    """
+
+    def __init__(self, queue: JobQueue, job_id: str, log_path: Optional[str] = None):
+        self.queue = queue
+        self.job_id = job_id
+        self._log = None
+        if log_path:
+            Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(log_path, "a", encoding="utf-8")
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        # Published on the flush thread's schedule
+        pass
+
+    def publish(self):
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer = []
+        if text:
+            if self._log:
+                self._log.write(text)
+                self._log.flush()
+            self.queue.add_event(self.job_id, "output", text)
+
+    def _flush_loop(self):
+        while not self._stop.wait(OUTPUT_FLUSH_INTERVAL):
+            self.publish()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.publish()
+        if self._log:
+            self._log.close()
+        super().close()
+
+def warm_up():
+    """Import the agent stack and open the shared clients before the first job arrives"""
+    started = time.perf_counter()
+    import run_workflow  # noqa: F401 - imports praisonaiagents, anthropic and the search tools
+    from utils.database import get_db
+    from utils.search_cache import get_search_cache
+    from utils.llm_cache import get_llm_cache
+
+    db = get_db()
+    db.check_connection()
+    get_search_cache()
+    get_llm_cache()
+    print(f"🔥 Worker warm in {time.perf_counter() - started:.1f}s ({db.connection_status})", flush=True)
+
+def run_job(queue: JobQueue, job: dict, api_key: str):
+    """Run one generation, publishing its output as events and recording the outcome"""
+    from run_workflow import run_workflow
+
+    output = JobOutput(queue, job["id"], job.get("log_path"))
+    previous_bypass = os.environ.get("BLOG_SEARCH_CACHE_BYPASS")
+    os.environ["BLOG_SEARCH_CACHE_BYPASS"] = "1" if job["options"].get("fresh_search") else ""
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            if RunCheckpoint.exists(job["run_id"]):
+                # Requeued from a stopped worker: pick up the checkpoints it already wrote
+                print(f"♻️ Resuming run {job['run_id']}", flush=True)
+                saved_post = run_workflow(job["topic"], job["analysis_depth"], api_key, resume=job["run_id"])
+            else:
+                saved_post = run_workflow(job["topic"], job["analysis_depth"], api_key, run_id=job["run_id"])
+        output.close()
+        if saved_post:
+            queue.complete(job["id"], saved_post.get("id"))
+        else:
+            queue.fail(job["id"], "Post was not saved")
+    except Exception as e:
+        output.close()
+        queue.fail(job["id"], str(e))
+    finally:
+        if previous_bypass is None:
+            os.environ.pop("BLOG_SEARCH_CACHE_BYPASS", None)
+        else:
+            os.environ["BLOG_SEARCH_CACHE_BYPASS"] = previous_bypass
+
+def run_worker(idle_exit=None):
+    """Consume generation jobs from the queue until interrupted
+
+    Args:
+        idle_exit: Stop after this many seconds without a job. Used for workers the
+            app starts on demand, so they don't outlive the jobs they were started for.
+    """
+    api_key = get_setting("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("ANTHROPIC_API_KEY must be set in the environment or .streamlit/secrets.toml")
+        sys.exit(1)
+
+    queue = get_job_queue()
+    worker_id = f"worker-{uuid.uuid4().hex[:8]}"
+    queue.heartbeat(worker_id, os.getpid())
+
+    stop = threading.Event()
+    def heartbeat_loop():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            queue.heartbeat(worker_id)
+    threading.Thread(target=heartbeat_loop, daemon=True).start()
+
+    warm_up()
+    requeued = queue.requeue_abandoned()
+    if requeued:
+        print(f"♻️ Requeued {requeued} jobs left by stopped workers", flush=True)
+    print(f"👷 {worker_id} waiting for jobs in {queue.path}", flush=True)
+
+    last_job = time.monotonic()
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                if idle_exit and time.monotonic() - last_job > idle_exit:
+                    print(f"💤 No jobs for {idle_exit:.0f}s; worker exiting", flush=True)
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+            print(f"▶️ Job {job['id']}: {job['topic']} ({job['analysis_depth']})", flush=True)
+            started = time.perf_counter()
+            run_job(queue, job, api_key)
+            finished = queue.get_job(job["id"])
+            print(f"⏹️ Job {job['id']} {finished['status']} in {time.perf_counter() - started:.0f}s", flush=True)
+            last_job = time.monotonic()
+    except KeyboardInterrupt:
+        print("👋 Worker stopping", flush=True)
+    finally:
+        stop.set()
+        queue.remove_worker(worker_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued blog generations")
+    parser.add_argument("--idle-exit", type=float, metavar="SECONDS", help="Exit after this long without a job")
+    args = parser.parse_args()
+
+    run_worker(idle_exit=args.idle_exit)
@@ -1,17 +1,96 @@
-from praisonaiagents import Agent, Task, PraisonAIAgents, Tools
-from praisonaiagents.tools import duckduckgo
-from utils.database import BlogPostDB
+from praisonaiagents import Agent, Task, Tools
+from utils.database import BlogPostDB, get_db
+from utils.task_scheduler import TaskScheduler, run_single_task
+from utils.research import gather_research
+from utils.backends import get_setting
+from utils.search_cache import duckduckgo, get_search_cache
+from utils.llm_cache import cached_task_runner, get_llm_cache
+from utils.streaming import stream_task, complete_task, task_prompt, task_request, message_usage
+from utils.style_guide import style_system, with_style_guide
+from utils.depth_profiles import get_depth_profile, get_run_history, estimate_tokens
+from utils.rate_limit import get_llm_rate_limiter
+from utils.checkpoints import RunCheckpoint, downstream_of
+from utils.telemetry import Telemetry, EVENTS_FILE
 import os
 import sys
 import json
+import time
+import argparse
 from datetime import datetime
 
-def run_workflow(query, analysis_depth, api_key):
+def warn_similar_posts(query):
+    """Print existing posts that already cover the topic; only a warning, never fatal"""
+    try:
+        started = time.perf_counter()
+        matches = get_db().find_similar_posts(query)
+    except Exception as e:
+        print(f"⚠️ Couldn't check for similar posts: {str(e)}", flush=True)
+        return
+    if matches:
+        print(f"⚠️ Similar posts already exist (checked in {(time.perf_counter() - started) * 1000:.0f}ms):", flush=True)
+        for match in matches:
+            print(f"   {match.score:.0%} {match.title} ({'published' if match.published else 'draft'}, {match.id})", flush=True)
+
+def compress_from_settings() -> bool:
+    """Whether BLOG_COMPRESS_CONTEXT turns the compress stage on"""
+    return str(get_setting("BLOG_COMPRESS_CONTEXT", "off")).lower() in ("1", "on", "true", "yes")
+
+def run_workflow(query, analysis_depth, api_key, research_mode=None, resume=None, rerun=(), compress=None, run_id=None):
+    """Research, write and save a draft post, checkpointing each task under runs/<run_id>/
+
+    Args:
+        query: Topic to write about (ignored when resuming)
+        analysis_depth: Basic, Detailed or Comprehensive (ignored when resuming)
+        api_key: Anthropic API key
+        research_mode: "fanout" or "agent", defaulting to BLOG_RESEARCH_MODE
+        resume: Run ID to continue; tasks with a checkpoint are restored instead of run
+        rerun: Task names to run again when resuming, along with every task that reads them
+        compress: Condense research and analysis into a capped brief before writing,
+            defaulting to BLOG_COMPRESS_CONTEXT, or to the run's own choice when resuming
+        run_id: ID for a new run's checkpoints, so a caller can resume it later; generated if not given
+
+    Returns:
+        The saved post, or None if saving failed
+    """
     # Set API key for the agent
     os.environ["ANTHROPIC_API_KEY"] = api_key
+    
+    if resume:
+        checkpoint = RunCheckpoint.open(resume)
+        manifest = checkpoint.manifest
+        query, analysis_depth = manifest["query"], manifest["analysis_depth"]
+        research_mode = research_mode or manifest["research_mode"]
+        # The saved stages were produced with the run's own compress choice, so keep it
+        # unless --compress is given; manifests from before it was recorded fall back to the setting
+        if compress is None:
+            compress = manifest["compress"] if "compress" in manifest else compress_from_settings()
+        compress_max_tokens = manifest.get("compress_max_tokens") or int(get_setting("BLOG_COMPRESS_MAX_TOKENS", "1500"))
+        checkpoint.update_manifest(compress=compress, compress_max_tokens=compress_max_tokens)
+        print(f"🗂️ Resuming run {checkpoint.run_id}: {query} ({analysis_depth})", flush=True)
+    else:
+        # "fanout" searches sub-questions in parallel up front; "agent" lets the research agent search serially
+        research_mode = research_mode or get_setting("BLOG_RESEARCH_MODE", "fanout")
+        if compress is None:
+            compress = compress_from_settings()
+        compress_max_tokens = int(get_setting("BLOG_COMPRESS_MAX_TOKENS", "1500"))
+        checkpoint = RunCheckpoint.start(query, analysis_depth, research_mode,
+                                         compress=compress, compress_max_tokens=compress_max_tokens, run_id=run_id)
+        print(f"🗂️ Run {checkpoint.run_id}: checkpoints in {checkpoint.path}", flush=True)
+        warn_similar_posts(query)
+    # Structured stage events, appended to runs/<run_id>/events.jsonl and echoed to stdout
+    telemetry = Telemetry(checkpoint.run_id, checkpoint.path / EVENTS_FILE)
+    telemetry.emit("run_start", query=query, analysis_depth=analysis_depth,
+                   research_mode=research_mode, resumed=bool(resume), compress_context=compress)
+    # Set BLOG_PROMPT_CACHE=off to measure a run without Anthropic prompt caching
+    prompt_caching = get_setting("BLOG_PROMPT_CACHE", "on") != "off"
 
     # Initialize database client
     db = BlogPostDB()
+    
+    # The depth profile sets search breadth, token budgets and whether analysis runs
+    profile = get_depth_profile(analysis_depth)
+    print(f"🎚️ Depth profile {profile.description}", flush=True)
+    started = time.perf_counter()
 
     # LLM Configuration
     llm_config = {
@@ -20,6 +99,12 @@ def run_workflow(query, analysis_depth, api_key):
         "temperature": 0.7,
         "max_tokens": 8192
     }
+    
+    def stage_config(task_name):
+        if task_name == "compress":
+            # Deterministic, so identical inputs are served from the LLM cache
+            return {**llm_config, "temperature": 0, "max_tokens": compress_max_tokens}
+        return {**llm_config, "max_tokens": profile.max_tokens_for(task_name)}
 
     # Create agents
     research_agent = Agent(
@@ -27,8 +112,8 @@ def run_workflow(query, analysis_depth, api_key):
         role="Tech Research Friend",
         goal="Find interesting and practical insights about topics that make you go 'huh, that's cool!'",
         backstory="I'm that friend who loves exploring tech and sharing the cool stuff I find - no fancy jargon, just real experiences and useful insights",
-        tools=[duckduckgo],
-        llm=llm_config
+        tools=[telemetry.counted_tool("research", duckduckgo)] if research_mode == "agent" else [],
+        llm=stage_config("research")
     )
 
     analysis_agent = Agent(
@@ -36,7 +121,15 @@ def run_workflow(query, analysis_depth, api_key):
         role="Insight Builder",
         goal="Connect ideas in unexpected ways and find the real value in what we've learned",
         backstory="I help piece together the puzzle, finding those 'aha!' moments that make complex topics click",
-        llm=llm_config
+        llm=stage_config("analyze")
+    )
+
+    editor_agent = Agent(
+        name="Brief Editor",
+        role="Research Editor",
+        goal="Boil research down to the facts, sources and insights a writer actually needs",
+        backstory="I cut repetition and filler from research notes without losing a single citation or number",
+        llm=stage_config("compress")
     )
 
     writing_agent = Agent(
@@ -44,7 +137,7 @@ def run_workflow(query, analysis_depth, api_key):
         role="Tech Storyteller",
         goal="Create engaging, conversational blog posts that feel like a coffee chat between friends",
         backstory="I turn tech insights into stories that flow naturally, using a casual but clear style that makes complex topics approachable",
-        llm=llm_config
+        llm=stage_config("write")
     )
 
     # Create tasks
@@ -63,173 +156,266 @@ IMPORTANT: Return ONLY this JSON with NO extra text or formatting:
         agent=writing_agent
     )
 
+    research_description = f"""Hey--- let's find what makes {query} really interesting. What's the REAL value here? What got me excited enough to write about it?
+
+If something interesting comes up, explore it--- tangents can lead to cool insights."""
     research_task = Task(
         name="research",
-        description=f"""Hey--- let's find what makes {query} really interesting. What's the REAL value here? What got me excited enough to write about it?
-
-STYLE GUIDE:
-- Write like we're having a coffee chat--- casual but clear
-- Use dashes (---) to break up thoughts and add emphasis
-- CAPITALIZE things when they're exciting or important
-- Share the learning journey--- no expert claims, just real experiences
-- Keep it practical--- theory is cool but what can we actually DO with this?
-- Be honest about what you're still figuring out
-- Connect ideas in unexpected ways
-
-WORD CHOICE:
-- Use "explore" instead of "dive into"
-- Use "improve" instead of "enhance"
-- Use "find" instead of "discover"
-- Use "show" instead of "unveil"
-- Use "complete" instead of "comprehensive"
-- Use "ask" instead of "inquire"
-- Use "experience" instead of "journey"
-- Use "use" instead of "leverage/utilize"
-- Use "help" instead of "facilitate"
-- Use "explain" instead of "elucidate"
-- Use "combine" instead of "synthesize"
-- Use "speed up" instead of "expedite"
-- Use "develop" instead of "cultivate"
-- Use "express" instead of "articulate"
-- Use "spread" instead of "proliferate"
-- Use "increase" instead of "augment"
-- Use "show" instead of "manifest"
-- Use "examine" instead of "scrutinize"
-- Use "confirm" instead of "validate"
-
-Remember:
-- If something interesting comes up, explore it--- tangents can lead to cool insights
-- Share what worked, what didn't, what surprised you
-- Keep it real--- we're all learning here
-- Connect ideas in unexpected ways
-- Make it feel like a conversation between friends exploring tech together""",
+        # The style guide goes in the system prompt for stages we call directly;
+        # the agent framework only sees the description
+        description=with_style_guide(research_description) if research_mode == "agent" else research_description,
         expected_output="Research findings with practical insights and real examples",
         agent=research_agent
     )
 
-    analysis_task = Task(
+    # Basic depth goes straight from research to writing
+    analysis_task = None if not profile.run_analysis else Task(
         name="analyze",
-        description=f"""Take our research about {query} and find those 'huh, interesting!' connections. What patterns jump out? What surprised you? Keep it practical--- what can we actually DO with this?
-
-Follow the same style guide:
-- Write like we're having a coffee chat--- casual but clear
-- Use dashes (---) to break up thoughts and add emphasis
-- CAPITALIZE things when they're exciting or important
-- Share the learning journey--- no expert claims, just real experiences
-- Keep it practical--- theory is cool but what can we actually DO with this?
-- Be honest about what you're still figuring out
-- Connect ideas in unexpected ways
-
-Avoid these words:
-- "dive into" (use "explore")
-- "enhance" (use "improve")
-- "discover" (use "find")
-- "unveil" (use "show")
-- "comprehensive" (use "complete")
-- "inquire" (use "ask")
-- "journey" (use "experience")
-- "leverage/utilize" (use "use")
-- "facilitate" (use "help")
-- "elucidate" (use "explain")
-- "synthesize" (use "combine")
-- "expedite" (use "speed up")
-- "cultivate" (use "develop")
-- "articulate" (use "express")
-- "proliferate" (use "spread")
-- "augment" (use "increase")
-- "manifest" (use "show")
-- "scrutinize" (use "examine")
-- "validate" (use "confirm")""",
+        description=f"""Take our research about {query} and find those 'huh, interesting!' connections. What patterns jump out? What surprised you? Keep it practical--- what can we actually DO with this?""",
         expected_output="Analysis highlighting key patterns and practical applications",
         agent=analysis_agent,
         context=[research_task]
     )
 
-    writing_task = Task(
-        name="write",
-        description=f"""Time to craft our blog post about {query}! Write this exactly like we're having a coffee chat--- casual but clear, using dashes (---) for emphasis, and CAPITALIZING exciting points.
+    # Optionally condense research and analysis so the writer, the most expensive
+    # call, gets a capped brief instead of both full outputs
+    writer_sources = [task for task in (research_task, analysis_task) if task is not None]
+    compress_task = None if not compress else Task(
+        name="compress",
+        description=f"""Condense the research{' and analysis' if analysis_task else ''} about {query} into a brief for the writer of at most {compress_max_tokens} tokens.
+
+KEEP:
+- Every citation marker like [3], attached to the fact it supports
+- Concrete facts, numbers, names, tools and examples
+- Surprising findings and the key patterns and practical takeaways
 
-Here's how I write:
-1. Like I'm talking to a friend--- casual but clear
-2. Using dashes (---) to break up thoughts and add emphasis
-3. CAPITALIZING things when I'm excited
-4. Sharing what I'm learning--- no expert claims
-5. Keeping it practical--- what can we actually DO?
-6. Being honest about what I'm still figuring out
-7. Connecting ideas in unexpected ways
-8. Breaking rules when it feels natural
-9. Mixing short, punchy statements with longer explanations
-10. Making things ACTUALLY useful--- no fluff
+DROP:
+- Anything said more than once
+- Filler, hedging and conversational framing
 
-IMPORTANT WORD CHOICES:
-- Use "explore" not "dive into"
-- Use "improve" not "enhance"
-- Use "find" not "discover"
-- Use "show" not "unveil"
-- Use "complete" not "comprehensive"
-- Use "ask" not "inquire"
-- Use "experience" not "journey"
-- Use "use" not "leverage/utilize"
-- Use "help" not "facilitate"
-- Use "explain" not "elucidate"
-- Use "combine" not "synthesize"
-- Use "speed up" not "expedite"
-- Use "develop" not "cultivate"
-- Use "express" not "articulate"
-- Use "spread" not "proliferate"
-- Use "increase" not "augment"
-- Use "show" not "manifest"
-- Use "examine" not "scrutinize"
-- Use "confirm" not "validate"
+Use short headings and terse bullet points. Do not write the post itself.""",
+        expected_output=f"Bullet-point brief under {compress_max_tokens} tokens with citations kept",
+        agent=editor_agent,
+        context=writer_sources
+    )
 
-Remember:
-- Share interesting tangents
-- Tell the story of what worked and what didn't
-- Keep it real--- we're all learning
-- Connect ideas in unexpected ways
-- Make it feel like friends chatting about tech""",
+    writing_task = Task(
+        name="write",
+        description=f"""Time to craft our blog post about {query}! Write it exactly the way the style guide describes--- tell the story of what worked and what didn't, and make it ACTUALLY useful.""",
         expected_output="Engaging blog post in markdown format",
         agent=writing_agent,
-        context=[metadata_task, research_task, analysis_task]
+        context=[metadata_task, compress_task] if compress_task else [metadata_task, *writer_sources]
     )
 
-    # Initialize workflow
-    workflow = PraisonAIAgents(
-        agents=[research_agent, analysis_agent, writing_agent],
-        tasks=[metadata_task, research_task, analysis_task, writing_task],
-        process="sequential",
-        verbose=True
-    )
+    # Tasks named here stream their output token by token instead of printing it at the end
+    streamed_tasks = [name.strip() for name in get_setting("BLOG_STREAM_TASKS", "write").split(",")]
+    streamed = set()
+    # Token use per task that actually called the model (cache hits cost nothing)
+    usage = {}
+    
+    def stage_system(task):
+        if task is compress_task:
+            return None
+        persona = task_prompt(task)["system"]
+        if task is research_task or (task is writing_task and compress_task):
+            # The style guide alone is under the 1024-token minimum Anthropic caches
+            return style_system(persona, cache=False)
+        # Analysis and writing both read the research findings, so they go in the
+        # cached block after the style guide: analysis writes the cache, writing reads it
+        findings = research_task.result.raw if research_task.result else ""
+        return style_system(
+            persona,
+            shared=f"RESEARCH FINDINGS ABOUT {query}:\n\n{findings}",
+            cache=prompt_caching and profile.run_analysis and not compress_task
+        )
+    
+    def is_direct(task):
+        # Stages without tools are called directly so the shared style guide can be cached
+        return task is not metadata_task and not (task is research_task and research_mode == "agent")
+    
+    def stage_skip_context(task):
+        # Analysis and uncompressed writing get the findings in the system prompt instead
+        return (research_task.name,) if task is analysis_task or task is writing_task else ()
+    
+    def stage_request(task):
+        """The request a direct stage sends, so its LLM cache key covers the system blocks too"""
+        if not is_direct(task):
+            return None
+        return task_request(task, stage_config(task.name), stage_system(task), stage_skip_context(task))
+    
+    def run_stage(task):
+        # Counted as one call against the shared limit; agent tool loops can make a few more
+        waited = get_llm_rate_limiter().acquire()
+        if waited:
+            print(f"⏳ Waited {waited:.1f}s for the LLM rate limit before '{task.name}'", flush=True)
+        if is_direct(task):
+            skip_context = stage_skip_context(task)
+            if task.name in streamed_tasks or "all" in streamed_tasks:
+                message = stream_task(task, stage_config(task.name), system=stage_system(task), skip_context=skip_context)
+                streamed.add(task.name)
+            else:
+                message = complete_task(task, stage_config(task.name), system=stage_system(task), skip_context=skip_context)
+            usage[task.name] = message_usage(message)
+        else:
+            run_single_task(task)
+            prompt = task_prompt(task)
+            usage[task.name] = {
+                "input_tokens": estimate_tokens(prompt["system"] + prompt["message"]),
+                "output_tokens": estimate_tokens(task.result.raw if task.result else ""),
+                "estimated": True
+            }
+    
+    # Identical task requests reuse earlier outputs when the LLM cache policy allows
+    run_cached = cached_task_runner(run_stage, lambda task: stage_config(task.name), request_for=stage_request)
+    
+    # Run tasks as soon as their context is ready: metadata runs alongside
+    # research/analysis and everything joins at the writing task
+    tasks = [task for task in (metadata_task, research_task, analysis_task, compress_task, writing_task) if task is not None]
+    
+    # Re-running a task also re-runs everything that read its output
+    rerun = downstream_of(tasks, rerun)
+    if rerun:
+        print(f"🔁 Re-running {', '.join(rerun)}", flush=True)
+        checkpoint.discard(rerun)
+    restored = set()
+    stage_seconds = {}
+    
+    def report_compression():
+        # Compare the writer's real input with what it would have been given the full outputs
+        source_tokens = sum(estimate_tokens(task.result.raw) for task in writer_sources if task.result)
+        brief_tokens = estimate_tokens(compress_task.result.raw if compress_task.result else "")
+        writer_input = usage.get(writing_task.name, {}).get("input_tokens")
+        if writer_input is None:
+            return
+        uncompressed = writer_input - brief_tokens + source_tokens
+        print(f"🗜️ Writer input ~{writer_input:,} tokens with the compressed brief, ~{uncompressed:,} without "
+              f"({1 - writer_input / max(uncompressed, 1):.0%} smaller). Compression took "
+              f"{stage_seconds.get(compress_task.name, 0):.1f}s, writing {stage_seconds.get(writing_task.name, 0):.1f}s", flush=True)
+        telemetry.emit("compression", source_tokens=source_tokens, brief_tokens=brief_tokens,
+                       writer_input_tokens=writer_input, writer_input_tokens_uncompressed=uncompressed,
+                       compress_seconds=round(stage_seconds.get(compress_task.name, 0), 3),
+                       write_seconds=round(stage_seconds.get(writing_task.name, 0), 3))
+    
+    def run_task(task):
+        telemetry.emit("stage_start", stage=task.name)
+        if checkpoint.restore(task):
+            restored.add(task.name)
+            print(f"♻️ Restored '{task.name}' from checkpoint", flush=True)
+            telemetry.emit("stage_end", stage=task.name, seconds=0.0, restored=True)
+            return
+        task_started = time.perf_counter()
+        try:
+            if task is research_task and research_mode == "fanout":
+                brief = gather_research(query, analysis_depth, api_key)
+                telemetry.count(task.name, "searches", len(brief.questions))
+                task.description += (
+                    "\n\nWork from this research brief, gathered from several searches run in parallel. "
+                    "Cite sources by their [number]:\n\n" + brief.to_markdown()
+                )
+            run_cached(task)
+        except Exception as e:
+            telemetry.emit("stage_error", stage=task.name, seconds=round(time.perf_counter() - task_started, 3),
+                           error=str(e))
+            raise
+        seconds = time.perf_counter() - task_started
+        checkpoint.save(task, seconds)
+        stage_seconds[task.name] = seconds
+        # Stages without a usage entry were served from the LLM cache. The writing
+        # stage is tagged so the run report can compare it with and without compression.
+        telemetry.emit("stage_end", stage=task.name, seconds=round(seconds, 3),
+                       **usage.get(task.name, {"input_tokens": 0, "output_tokens": 0, "cached": True}),
+                       **{"tool_calls": 0, "searches": 0, **telemetry.counters(task.name)},
+                       **({"compressed_context": bool(compress_task)} if task is writing_task else {}))
+        if task is writing_task and compress_task:
+            report_compression()
+    
+    scheduler = TaskScheduler(tasks, run_task=run_task)
 
     print("🚀 Starting blog creation process...", flush=True)
-    result = workflow.start()
-    
     try:
-        # Get metadata
-        metadata = json.loads(metadata_task.result.raw) if metadata_task.result else {}
-        
-        # Get the final blog post content
-        content = writing_task.result.raw if writing_task.result else ""
-        
-        # Prepare blog post data
-        blog_post = {
-            "title": metadata.get("title", f"Blog Post about {query}"),
-            "description": metadata.get("description", ""),
-            "content": content,
-            "tags": metadata.get("tags", []),
-            "type": metadata.get("type", "insight"),
-            "published": False,  # Save as draft
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-        
-        # Save to database
-        print("\n💾 Saving blog post as draft...", flush=True)
-        saved_post = db.save_blog_post(blog_post)
-        print(f"✅ Blog post saved with ID: {saved_post.get('id')}", flush=True)
+        scheduler.run()
+    except Exception:
+        print(f"❌ Generation failed; finished tasks are saved. Resume with: "
+              f"python run_workflow.py --resume {checkpoint.run_id}", flush=True)
+        raise
+    print(scheduler.report(), flush=True)
+    
+    # Record what this depth cost so the UI can show measured numbers per profile
+    stages = {
+        task.name: {"seconds": scheduler.timings[task.name].seconds,
+                    **usage.get(task.name, {"input_tokens": 0, "output_tokens": 0, "cached": True})}
+        for task in tasks
+    }
+    # Resumed runs skip stages, so they would skew the measured cost of the depth
+    if not restored:
+        get_run_history().record(profile.name, time.perf_counter() - started, stages)
+    input_tokens = sum(stage["input_tokens"] for stage in stages.values())
+    output_tokens = sum(stage["output_tokens"] for stage in stages.values())
+    cache_write = sum(stage.get("cache_write_tokens", 0) for stage in stages.values())
+    cache_read = sum(stage.get("cache_read_tokens", 0) for stage in stages.values())
+    print(f"🔢 Tokens: ~{input_tokens:,} input, ~{output_tokens:,} output "
+          f"in {time.perf_counter() - started:.0f}s at {profile.name} depth", flush=True)
+    # Cache writes are billed at 1.25x and reads at 0.1x of the input price
+    billed_input = input_tokens - cache_write - cache_read + cache_write * 1.25 + cache_read * 0.1
+    print(f"🧾 Prompt cache ({'on' if prompt_caching else 'off'}): {cache_read:,} input tokens read, "
+          f"{cache_write:,} written; input billed as ~{billed_input:,.0f} of ~{input_tokens:,} tokens", flush=True)
+    
+    stats = get_search_cache().stats()
+    print(f"🗄️ Search cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['stale_hits']} stale, {stats['entries']} entries", flush=True)
+    print(get_llm_cache().summary(), flush=True)
+    
+    saved_post = None
+    post_id = checkpoint.manifest.get("post_id")
+    if post_id and not rerun:
+        # A resume after the post was saved shouldn't create a duplicate draft
+        saved_post = db.get_blog_post(post_id)
+        print(f"✅ Blog post already saved with ID: {post_id}", flush=True)
+    else:
+        try:
+            # Get metadata
+            metadata = json.loads(metadata_task.result.raw) if metadata_task.result else {}
+            
+            # Get the final blog post content
+            content = writing_task.result.raw if writing_task.result else ""
+            
+            # Prepare blog post data
+            blog_post = {
+                "title": metadata.get("title", f"Blog Post about {query}"),
+                "description": metadata.get("description", ""),
+                "content": content,
+                "tags": metadata.get("tags", []),
+                "type": metadata.get("type", "insight"),
+                "updated_at": datetime.now().isoformat()
+            }
+            
+            if post_id and db.get_blog_post(post_id):
+                # A rerun fixes the draft this run already saved rather than adding a second one
+                print(f"\n💾 Updating saved blog post {post_id}...", flush=True)
+                saved_post = db.update_blog_post(post_id, blog_post)
+                if not saved_post:
+                    raise Exception(f"blog post {post_id} could not be updated")
+                print(f"✅ Blog post updated with ID: {post_id}", flush=True)
+            else:
+                # Save to database
+                print("\n💾 Saving blog post as draft...", flush=True)
+                saved_post = db.save_blog_post({
+                    **blog_post,
+                    "published": False,  # Save as draft
+                    "created_at": blog_post["updated_at"]
+                })
+                print(f"✅ Blog post saved with ID: {saved_post.get('id')}", flush=True)
+                checkpoint.update_manifest(post_id=saved_post.get("id"))
+            
+        except Exception as e:
+            print(f"❌ Error saving blog post: {str(e)}", flush=True)
+            print(f"↩️ Retry the save with: python run_workflow.py --resume {checkpoint.run_id} "
+                  f"(add --rerun metadata to regenerate bad metadata)", flush=True)
         
-    except Exception as e:
-        print(f"❌ Error saving blog post: {str(e)}", flush=True)
+    telemetry.emit("run_end", seconds=round(time.perf_counter() - started, 3), analysis_depth=profile.name,
+                   input_tokens=input_tokens, output_tokens=output_tokens,
+                   cache_read_tokens=cache_read, cache_write_tokens=cache_write,
+                   post_id=saved_post.get("id") if saved_post else None)
     
     # Print results for each task
     print("\n📝 Metadata:", flush=True)
@@ -241,20 +427,42 @@ Remember:
         print(research_task.result.raw, flush=True)
     
     print("\n💡 Analysis:", flush=True)
-    if analysis_task.result:
+    if analysis_task is None:
+        print(f"(skipped at {profile.name} depth)", flush=True)
+    elif analysis_task.result:
         print(analysis_task.result.raw, flush=True)
     
+    if compress_task and compress_task.result:
+        print("\n🗜️ Writer Brief:", flush=True)
+        print(compress_task.result.raw, flush=True)
+    
     print("\n✍️ Blog Post:", flush=True)
-    if writing_task.result:
+    if writing_task.name in streamed:
+        print("(streamed above)", flush=True)
+    elif writing_task.result:
         print(writing_task.result.raw, flush=True)
+    
+    return saved_post
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python run_workflow.py <query> <analysis_depth> <api_key>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Research, write and save a draft blog post")
+    parser.add_argument("query", nargs="?", help="Topic to write about")
+    parser.add_argument("analysis_depth", nargs="?", choices=["Basic", "Detailed", "Comprehensive"])
+    parser.add_argument("api_key", nargs="?", help="Anthropic API key (defaults to ANTHROPIC_API_KEY)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Continue a run from its checkpoints in runs/")
+    parser.add_argument("--compress", action="store_true", default=None,
+                        help="Condense research and analysis before writing (default: BLOG_COMPRESS_CONTEXT)")
+    parser.add_argument("--rerun", action="append", default=[], choices=["metadata", "research", "analyze", "compress", "write"],
+                        help="With --resume, run this task again (and the tasks that read it)")
+    args = parser.parse_args()
     
-    query = sys.argv[1]
-    analysis_depth = sys.argv[2]
-    api_key = sys.argv[3]
+    if not args.resume and not (args.query and args.analysis_depth):
+        parser.error("query and analysis_depth are required unless resuming")
+    if args.rerun and not args.resume:
+        parser.error("--rerun needs --resume")
+    api_key = args.api_key or get_setting("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("ANTHROPIC_API_KEY must be set in the environment or .streamlit/secrets.toml")
+        sys.exit(1)
     
-    run_workflow(query, analysis_depth, api_key) 
\ No newline at end of file
+    run_workflow(args.query, args.analysis_depth, api_key, resume=args.resume, rerun=args.rerun, compress=args.compress)
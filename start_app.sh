@@ -23,6 +23,16 @@ pip install reportlab
 echo "Installing required packages..."
 pip install -r requirements.txt
 
+# Start generation workers in the background so generations skip the cold start.
+# Each worker runs one generation at a time; set BLOG_WORKERS to run more at once.
+echo "Starting ${BLOG_WORKERS:-1} generation worker(s)..."
+WORKER_PIDS=""
+for _ in $(seq "${BLOG_WORKERS:-1}"); do
+    python run_worker.py &
+    WORKER_PIDS="$WORKER_PIDS $!"
+done
+trap 'kill $WORKER_PIDS 2>/dev/null' EXIT
+
 # Start the Streamlit app
 echo "Starting Invoice Generator..."
 streamlit run app.py 
\ No newline at end of file
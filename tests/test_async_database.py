@@ -0,0 +1,31 @@
+import asyncio
+
+from utils.async_database import AsyncDatabaseClient
+from utils.backends import SQLiteBackend
+
+def make_client(tmp_path, max_concurrency=1):
+    backend = SQLiteBackend(tmp_path / "posts.db", tmp_path / "storage")
+    return AsyncDatabaseClient(backend=backend, max_concurrency=max_concurrency)
+
+def test_client_reused_across_event_loops(tmp_path):
+    client = make_client(tmp_path)
+    post = asyncio.run(client.create_post({"title": "Loops", "content": "x", "published": False}))
+
+    async def fetch_many():
+        # More calls than slots, so they contend for the concurrency limit
+        return await client.get_blog_posts_by_ids([post["id"]] * 5)
+
+    for _ in range(2):
+        posts = asyncio.run(fetch_many())
+        assert [item["id"] for item in posts] == [post["id"]] * 5
+
+def test_toggle_publish_stamps_updated_at(tmp_path):
+    client = make_client(tmp_path, max_concurrency=4)
+
+    async def toggle():
+        post = await client.create_post({"title": "Toggle", "content": "x", "published": False})
+        return post, await client.toggle_publish_status(post["id"], True)
+
+    before, after = asyncio.run(toggle())
+    assert after["published"] is True
+    assert after["updated_at"] != before["updated_at"]
@@ -0,0 +1,250 @@
+import asyncio
+import inspect
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+from utils.backends import PostBackend
+from utils.database import DatabaseClient, MediaContent, get_db
+from utils.search import PostSearchIndex
+
+class AsyncDatabaseClient:
+    """Asyncio interface to DatabaseClient for concurrent post and media operations
+
+    This is a thread-pool wrapper, not an async transport: every call runs a
+    DatabaseClient method, and so the configured PostBackend's blocking client, in
+    a worker thread via asyncio.to_thread. Each in-flight call holds a thread; the
+    I/O itself is not non-blocking. In exchange, queries, the post cache, the
+    search index and write semantics (updated_at stamping, MediaContent conversion,
+    optimistic concurrency) are exactly those of the sync client, on Supabase and
+    SQLite alike. Fan-out helpers such as get_blog_posts_by_ids, upload_many_media
+    and delete_posts run their calls concurrently, bounded by max_concurrency so a
+    large batch can't open hundreds of connections at once.
+    """
+
+    def __init__(
+        self,
+        database: Optional[DatabaseClient] = None,
+        backend: Optional[PostBackend] = None,
+        search_index: Optional[PostSearchIndex] = None,
+        max_concurrency: int = 8
+    ):
+        """Initialize without touching the network
+
+        Args:
+            database: DatabaseClient to run calls on. Defaults to the process-wide one,
+                or to a new client on `backend` when one is given.
+            backend: A storage backend to use instead of the process-wide one
+            search_index: Search index to keep updated when `backend` is given
+            max_concurrency: Maximum number of calls fan-out helpers run at once
+        """
+        if database is None:
+            database = DatabaseClient(backend=backend, search_index=search_index) if backend is not None else get_db()
+        self.database = database
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop: asyncio primitives are bound to the loop that first
+        # waits on them, and the client may be reused under another asyncio.run()
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    @property
+    def backend(self) -> PostBackend:
+        return self.database.backend
+
+    @property
+    def cache(self):
+        return self.database.cache
+
+    @property
+    def search_index(self) -> Optional[PostSearchIndex]:
+        return self.database.search_index
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Run a DatabaseClient method in a worker thread under the concurrency limit"""
+        async with self._semaphore():
+            return await asyncio.to_thread(getattr(self.database, method), *args, **kwargs)
+
+    async def gather(self, *coros) -> List[Any]:
+        """Run coroutines concurrently, keeping their order
+
+        Calls made through this client already wait for a slot, so at most
+        max_concurrency of them are in flight at a time.
+        """
+        return list(await asyncio.gather(*coros))
+
+    async def check_connection(self) -> Dict[str, str]:
+        """Verify database and storage access"""
+        await self._call("check_connection")
+        return {"connection": self.database.connection_status, "storage": self.database.storage_status}
+
+    async def get_status(self) -> Dict[str, Any]:
+        return await self._call("get_status")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.database.get_cache_stats()
+
+    async def upload_media(self, file: Union[BinaryIO, bytes, str, Path], file_path: str) -> str:
+        """Upload media file to storage and return public URL"""
+        return await self._call("upload_media", file, file_path)
+
+    async def upload_many_media(self, files: Sequence[Tuple[Union[BinaryIO, bytes, str, Path], str]]) -> List[str]:
+        """Upload several media files concurrently
+
+        Args:
+            files: List of (file, file_path) pairs as taken by upload_media
+
+        Returns:
+            Public URLs in the same order as files
+        """
+        return await self.gather(*(self.upload_media(file, file_path) for file, file_path in files))
+
+    async def delete_media(self, file_path: str):
+        """Delete media file from storage"""
+        return await self._call("delete_media", file_path)
+
+    async def get_blog_posts(self, published_only: bool = False, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Get all blog posts"""
+        return await self._call("get_blog_posts", published_only, columns)
+
+    async def get_blog_posts_page(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        published: Optional[bool] = None,
+        page_size: int = 25,
+        cursor: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict[str, str]]]:
+        """Get one page of blog posts using keyset pagination on (created_at, id)"""
+        return await self._call("get_blog_posts_page", columns, published, page_size, cursor)
+
+    async def count_blog_posts(self, published: Optional[bool] = None) -> int:
+        """Count blog posts without transferring any rows"""
+        return await self._call("count_blog_posts", published)
+
+    async def search_posts(self, *args, **kwargs) -> List[Dict]:
+        """Full-text search over posts; see DatabaseClient.search_posts"""
+        return await self._call("search_posts", *args, **kwargs)
+
+    async def get_blog_post(self, post_id: str) -> Optional[Dict]:
+        """Get a specific blog post by ID"""
+        return await self._call("get_blog_post", post_id)
+
+    async def get_blog_posts_by_ids(self, post_ids: Sequence[str]) -> List[Optional[Dict]]:
+        """Fetch several full posts concurrently, e.g. the details for a listing page
+
+        Returns:
+            Posts in the same order as post_ids, None for any that don't exist
+        """
+        return await self.gather(*(self.get_blog_post(post_id) for post_id in post_ids))
+
+    async def save_blog_post(self, post) -> Dict:
+        """Save a new blog post to the database"""
+        return await self._call("save_blog_post", post)
+
+    async def create_post(self, post_data: dict) -> dict:
+        """Create a new post"""
+        return await self._call("create_post", post_data)
+
+    async def update_blog_post(self, post_id: str, updates: Dict, if_updated_at: Optional[str] = None) -> Dict:
+        """Update a blog post, raising ConcurrentUpdateError if `if_updated_at` no longer matches"""
+        return await self._call("update_blog_post", post_id, updates, if_updated_at=if_updated_at)
+
+    async def update_post(self, post_id: str, updates: dict) -> dict:
+        """Update an existing post, returning None if it doesn't exist"""
+        return await self._call("update_post", post_id, updates)
+
+    async def toggle_publish_status(self, post_id: str, publish: bool) -> Dict:
+        """Toggle the published status of a blog post"""
+        return await self._call("toggle_publish_status", post_id, publish)
+
+    async def bulk_set_published(self, post_ids: Sequence[str], publish: bool) -> List[Dict]:
+        """Set the published status of many posts"""
+        return await self._call("bulk_set_published", post_ids, publish)
+
+    async def bulk_update(self, patches: Sequence[Dict]) -> List[Dict]:
+        """Apply many partial updates; identical patches share one `in` update"""
+        return await self._call("bulk_update", patches)
+
+    async def bulk_insert(self, posts: Sequence[Dict]) -> List[Dict]:
+        """Insert many posts"""
+        return await self._call("bulk_insert", posts)
+
+    async def add_media_to_post(self, post_id: str, media: Union[MediaContent, List[MediaContent]]) -> Dict:
+        """Add media content to a blog post in one atomic append"""
+        return await self._call("add_media_to_post", post_id, media)
+
+    async def upload_post_image(self, file_path: str, file_data: bytes) -> str:
+        """Upload an image for a post to storage and return its URL"""
+        return await self._call("upload_post_image", file_path, file_data)
+
+    async def get_post(self, post_id: str) -> dict:
+        """Get a single post by ID"""
+        return await self._call("get_post", post_id)
+
+    async def delete_post(self, post_id: str) -> bool:
+        """Delete a post and its associated image"""
+        return await self._call("delete_post", post_id)
+
+    async def delete_posts(self, post_ids: Sequence[str]) -> List[bool]:
+        """Delete several posts (and their images) concurrently"""
+        return await self.gather(*(self.delete_post(post_id) for post_id in post_ids))
+
+    async def get_signed_url(self, file_path: str, expires_in: int = 3600) -> str:
+        """Get a signed URL for a file that expires after the specified time"""
+        return await self._call("get_signed_url", file_path, expires_in)
+
+class SyncDatabaseFacade:
+    """Blocking wrapper around AsyncDatabaseClient for Streamlit pages and scripts
+
+    Coroutines run on one background event loop, so fan-out helpers still run
+    concurrently inside it. The manage posts page deletes selected posts with it:
+
+        facade = SyncDatabaseFacade()
+        deleted = facade.delete_posts(ids)
+    """
+
+    def __init__(self, async_client: Optional[AsyncDatabaseClient] = None):
+        self.async_client = async_client or AsyncDatabaseClient()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-db-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        """Run a coroutine on the facade's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.async_client, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            return self.run(attribute(*args, **kwargs))
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        return call
+
+    def close(self):
+        """Stop the background event loop"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+_default_facade = None
+_default_facade_lock = threading.Lock()
+
+def get_sync_async_db() -> SyncDatabaseFacade:
+    """Get the process-wide blocking facade over AsyncDatabaseClient"""
+    global _default_facade
+    if _default_facade is None:
+        with _default_facade_lock:
+            if _default_facade is None:
+                _default_facade = SyncDatabaseFacade()
+    return _default_facade
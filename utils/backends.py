@@ -0,0 +1,683 @@
+import os
+import csv
+import json
+import uuid
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union, BinaryIO
+
+import streamlit as st
+
+# Repository root, used for default local data paths
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Every column of the posts table, in CSV export order plus media
+POST_COLUMNS = [
+    "id", "title", "description", "content", "date", "type", "tags",
+    "thumbnail_url", "published", "created_at", "updated_at", "thumbnail", "media"
+]
+
+def get_setting(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a setting from the environment, falling back to Streamlit secrets"""
+    if name in os.environ:
+        return os.environ[name]
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        # No secrets file, e.g. when running outside the app
+        return default
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a conditional update finds the post changed since it was read"""
+
+class PostBackend(ABC):
+    """Storage operations the post pages and workflows need from a backend
+
+    Listings are always ordered by (order_by DESC, id DESC); a cursor of
+    (order_value, id) returns the rows strictly after that position.
+    """
+    name = "base"
+
+    @property
+    def identity(self) -> str:
+        """Which data store the backend reads, so state derived from it (like the
+        search index) can tell two projects or database files apart"""
+        return self.name
+
+    @abstractmethod
+    def list_posts(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        published: Optional[bool] = None,
+        order_by: str = "created_at",
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[str, str]] = None
+    ) -> List[Dict]:
+        """List posts, optionally projected to columns and filtered by published status"""
+
+    @abstractmethod
+    def list_changed_posts(
+        self,
+        after: Tuple[str, str],
+        columns: Optional[Sequence[str]] = None,
+        limit: int = 500
+    ) -> List[Dict]:
+        """List posts in ascending (updated_at, id) order, strictly after the given position
+
+        This is the change feed used to sync replicas: passing the last row seen
+        returns everything written since.
+        """
+
+    @abstractmethod
+    def count_posts(self, published: Optional[bool] = None) -> int:
+        """Count posts, optionally filtered by published status"""
+
+    @abstractmethod
+    def get_post(self, post_id: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """Get a post by ID, or None if it doesn't exist"""
+
+    @abstractmethod
+    def insert_posts(self, rows: Sequence[Dict]) -> List[Dict]:
+        """Insert posts and return the created rows"""
+
+    @abstractmethod
+    def update_posts(self, post_ids: Sequence[str], updates: Dict, if_updated_at: Optional[str] = None) -> List[Dict]:
+        """Apply the same updates to posts and return the updated rows
+
+        With if_updated_at, only rows whose updated_at still has that value are changed.
+        """
+
+    @abstractmethod
+    def delete_posts(self, post_ids: Sequence[str]) -> List[Dict]:
+        """Delete posts and return the deleted rows"""
+
+    @abstractmethod
+    def append_media(self, post_id: str, media: List[Dict]) -> Optional[Dict]:
+        """Atomically append media entries to a post, returning the updated row"""
+
+    @abstractmethod
+    def check_connection(self):
+        """Raise if the posts table can't be read"""
+
+    @abstractmethod
+    def upload_file(self, bucket: str, path: str, file: Union[BinaryIO, bytes, str, Path], file_options: Optional[Dict] = None):
+        """Upload a file to a storage bucket"""
+
+    @abstractmethod
+    def remove_files(self, bucket: str, paths: Sequence[str]):
+        """Remove files from a storage bucket"""
+
+    @abstractmethod
+    def list_files(self, bucket: str, folder: str, limit: Optional[int] = None) -> List[Dict]:
+        """List the files in a storage folder"""
+
+    @abstractmethod
+    def get_public_url(self, bucket: str, path: str) -> str:
+        """Get the public URL for a stored file"""
+
+    @abstractmethod
+    def create_signed_url(self, bucket: str, path: str, expires_in: int) -> str:
+        """Get a URL for a stored file that expires after expires_in seconds"""
+
+class SupabaseBackend(PostBackend):
+    """Backend on a Supabase project (PostgREST for posts, Supabase Storage for files)"""
+    name = "supabase"
+    # Server-side function that appends to posts.media in a single statement (see docs/setup.md)
+    APPEND_MEDIA_RPC = "append_post_media"
+    # Attempts for the read-then-conditional-write fallback when the RPC isn't installed
+    APPEND_MEDIA_RETRIES = 3
+
+    def __init__(self, url: str = None, key: str = None, client=None):
+        """Create the backend; the client is created on first use
+
+        Args:
+            url: Supabase project URL. Defaults to the process-wide shared client.
+            key: Supabase API key. Defaults to the process-wide shared client.
+            client: An existing client (or a local stand-in with the same interface)
+        """
+        self.url = url
+        self.key = key
+        self._client = client
+
+    @property
+    def identity(self) -> str:
+        return f"{self.name}:{self.url or get_setting('SUPABASE_URL', '')}"
+
+    @property
+    def client(self):
+        """The Supabase client, created on first access"""
+        if self._client is None:
+            if self.url:
+                from supabase import create_client
+                self._client = create_client(self.url, self.key)
+            else:
+                self._client = get_supabase_client()
+        return self._client
+
+    def list_posts(self, columns=None, published=None, order_by="created_at", limit=None, cursor=None):
+        query = self.client.table("posts").select(",".join(columns) if columns else "*")
+        if published is not None:
+            query = query.eq("published", published)
+        if cursor:
+            value, post_id = cursor
+            query = query.or_(
+                f'{order_by}.lt."{value}",'
+                f'and({order_by}.eq."{value}",id.lt."{post_id}")'
+            )
+        query = query.order(order_by, desc=True).order("id", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data or []
+
+    def list_changed_posts(self, after, columns=None, limit=500):
+        updated_at, post_id = after
+        return (self.client.table("posts")
+                .select(",".join(columns) if columns else "*")
+                .or_(f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt."{post_id}")')
+                .order("updated_at")
+                .order("id")
+                .limit(limit)
+                .execute()).data or []
+
+    def count_posts(self, published=None):
+        query = self.client.table("posts").select("id", count="exact", head=True)
+        if published is not None:
+            query = query.eq("published", published)
+        return query.execute().count or 0
+
+    def get_post(self, post_id, columns=None):
+        response = (self.client.table("posts")
+                   .select(",".join(columns) if columns else "*")
+                   .eq("id", post_id)
+                   .execute())
+        return response.data[0] if response.data else None
+
+    def insert_posts(self, rows):
+        return self.client.table("posts").insert(list(rows)).execute().data or []
+
+    def update_posts(self, post_ids, updates, if_updated_at=None):
+        query = self.client.table("posts").update(updates)
+        post_ids = list(post_ids)
+        query = query.eq("id", post_ids[0]) if len(post_ids) == 1 else query.in_("id", post_ids)
+        if if_updated_at is not None:
+            query = query.eq("updated_at", if_updated_at)
+        return query.execute().data or []
+
+    def delete_posts(self, post_ids):
+        return self.client.table("posts").delete().in_("id", list(post_ids)).execute().data or []
+
+    def append_media(self, post_id, media):
+        try:
+            response = self.client.rpc(
+                self.APPEND_MEDIA_RPC,
+                {"post_id": post_id, "new_media": media}
+            ).execute()
+        except Exception as e:
+            if not self._is_missing_function(e):
+                raise
+            return self._append_media_conditionally(post_id, media)
+        rows = response.data if isinstance(response.data, list) else [response.data]
+        return rows[0] if rows and rows[0] else None
+
+    def _append_media_conditionally(self, post_id: str, media: List[Dict]) -> Optional[Dict]:
+        """Append media with a read and an optimistic write, retrying if another write wins"""
+        for _ in range(self.APPEND_MEDIA_RETRIES):
+            existing_post = self.get_post(post_id, ["media", "updated_at"])
+            if not existing_post:
+                return None
+            rows = self.update_posts(
+                [post_id],
+                {
+                    "media": (existing_post.get("media") or []) + media,
+                    "updated_at": datetime.now().isoformat()
+                },
+                if_updated_at=existing_post.get("updated_at")
+            )
+            if rows:
+                return rows[0]
+        raise ConcurrentUpdateError(
+            f"Blog post with ID {post_id} kept changing while appending media"
+        )
+
+    @staticmethod
+    def _is_missing_function(error: Exception) -> bool:
+        """Check whether PostgREST rejected an RPC because the function doesn't exist"""
+        # PGRST202: function not found in the schema cache
+        return "PGRST202" in str(error) or "Could not find the function" in str(error)
+
+    def check_connection(self):
+        # A single-row read is enough to prove the connection works
+        self.client.table("posts").select("id").limit(1).execute()
+
+    def upload_file(self, bucket, path, file, file_options=None):
+        return self.client.storage.from_(bucket).upload(path=path, file=file, file_options=file_options or {})
+
+    def remove_files(self, bucket, paths):
+        return self.client.storage.from_(bucket).remove(list(paths))
+
+    def list_files(self, bucket, folder, limit=None):
+        options = {"limit": limit} if limit else None
+        return self.client.storage.from_(bucket).list(folder, options)
+
+    def get_public_url(self, bucket, path):
+        return self.client.storage.from_(bucket).get_public_url(path)
+
+    def create_signed_url(self, bucket, path, expires_in):
+        response = self.client.storage.from_(bucket).create_signed_url(path=path, expires_in=expires_in)
+        return response['signedURL']
+
+class SQLiteBackend(PostBackend):
+    """Local backend on a SQLite file, with files stored in a local directory
+
+    Used for offline mode, benchmarks and load tests. Tags and media are stored as
+    JSON text and timestamps are normalized to UTC ISO strings so they sort correctly.
+    """
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS posts (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            content TEXT,
+            date TEXT,
+            type TEXT,
+            tags TEXT NOT NULL DEFAULT '[]',
+            thumbnail_url TEXT,
+            published INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            thumbnail TEXT,
+            media TEXT NOT NULL DEFAULT '[]'
+        );
+        CREATE INDEX IF NOT EXISTS idx_posts_published_created ON posts (published, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_posts_date ON posts (date DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_posts_updated ON posts (updated_at, id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    JSON_COLUMNS = ("tags", "media")
+    TIMESTAMP_COLUMNS = ("date", "created_at", "updated_at")
+
+    def __init__(self, path: Union[str, Path] = ":memory:", storage_dir: Union[str, Path, None] = None):
+        """Open (and create if needed) the SQLite database
+
+        Args:
+            path: Database file, or ":memory:" for a throwaway database
+            storage_dir: Directory that stands in for storage buckets
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.storage_dir = Path(storage_dir or ROOT_DIR / ".cache" / "storage")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @property
+    def identity(self) -> str:
+        if self.path == ":memory:":
+            return f"{self.name}::memory:{id(self)}"
+        return f"{self.name}:{Path(self.path).resolve()}"
+
+    @staticmethod
+    def normalize_timestamp(value: Optional[str]) -> Optional[str]:
+        """Convert Postgres/ISO timestamps to one sortable UTC ISO format"""
+        if not value:
+            return value
+        text = str(value).strip().replace("Z", "+00:00")
+        # Postgres exports short offsets like "+00"
+        if len(text) > 3 and text[-3] in "+-" and text[-3:].lstrip("+-").isdigit():
+            text += ":00"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return value
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+    def _check_columns(self, columns: Optional[Sequence[str]]) -> str:
+        """Validate a projection and turn it into a SELECT list"""
+        if not columns:
+            return "*"
+        unknown = [column for column in columns if column not in POST_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown post columns: {', '.join(unknown)}")
+        return ", ".join(columns)
+
+    def _to_row(self, values: Dict) -> Dict:
+        """Encode a post dict for storage"""
+        row = {}
+        for key, value in values.items():
+            if key not in POST_COLUMNS:
+                raise ValueError(f"Unknown post column: {key}")
+            if key in self.JSON_COLUMNS:
+                value = json.dumps(value if value is not None else [])
+            elif key in self.TIMESTAMP_COLUMNS:
+                value = self.normalize_timestamp(value)
+            elif key == "published":
+                value = int(bool(value))
+            row[key] = value
+        return row
+
+    def _from_row(self, row: sqlite3.Row) -> Dict:
+        """Decode a stored row into the shape Supabase returns"""
+        post = dict(row)
+        for key in self.JSON_COLUMNS:
+            if key in post:
+                post[key] = json.loads(post[key]) if post[key] else []
+        if "published" in post:
+            post["published"] = bool(post["published"])
+        return post
+
+    def _new_row(self, post: Dict) -> Dict:
+        """Fill the defaults Postgres would apply to a new post"""
+        now = datetime.now(timezone.utc).isoformat()
+        row = {"id": str(uuid.uuid4()), "published": False, "tags": [], "media": [],
+               "created_at": now, "updated_at": now}
+        row.update({key: value for key, value in post.items() if value is not None})
+        return self._to_row(row)
+
+    def _select_ids(self, post_ids: Sequence[str]) -> List[Dict]:
+        placeholders = ", ".join("?" for _ in post_ids)
+        rows = self._conn.execute(
+            f"SELECT * FROM posts WHERE id IN ({placeholders})", list(post_ids)
+        ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def list_posts(self, columns=None, published=None, order_by="created_at", limit=None, cursor=None):
+        if order_by not in POST_COLUMNS:
+            raise ValueError(f"Unknown post column: {order_by}")
+        sql = f"SELECT {self._check_columns(columns)} FROM posts"
+        where, params = [], []
+        if published is not None:
+            where.append("published = ?")
+            params.append(int(published))
+        if cursor:
+            value, post_id = cursor
+            if order_by in self.TIMESTAMP_COLUMNS:
+                value = self.normalize_timestamp(value)
+            where.append(f"({order_by} < ? OR ({order_by} = ? AND id < ?))")
+            params.extend([value, value, post_id])
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [self._from_row(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def list_changed_posts(self, after, columns=None, limit=500):
+        updated_at, post_id = after
+        updated_at = self.normalize_timestamp(updated_at)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._check_columns(columns)} FROM posts "
+                "WHERE updated_at > ? OR (updated_at = ? AND id > ?) "
+                "ORDER BY updated_at, id LIMIT ?",
+                (updated_at, updated_at, post_id, limit)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def count_posts(self, published=None):
+        with self._lock:
+            if published is None:
+                return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM posts WHERE published = ?", (int(published),)
+            ).fetchone()[0]
+
+    def get_post(self, post_id, columns=None):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._check_columns(columns)} FROM posts WHERE id = ?", (str(post_id),)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def insert_posts(self, rows):
+        rows = [self._new_row(post) for post in rows]
+        if not rows:
+            return []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    columns = ", ".join(row)
+                    placeholders = ", ".join("?" for _ in row)
+                    self._conn.execute(
+                        f"INSERT INTO posts ({columns}) VALUES ({placeholders})", list(row.values())
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._select_ids([row["id"] for row in rows])
+
+    def update_posts(self, post_ids, updates, if_updated_at=None):
+        post_ids = [str(post_id) for post_id in post_ids]
+        if not post_ids:
+            return []
+        # Every write moves updated_at, like the Postgres trigger in docs/setup.md
+        updates = {"updated_at": datetime.now(timezone.utc).isoformat(), **updates}
+        row = self._to_row(updates)
+        assignments = ", ".join(f"{column} = ?" for column in row)
+        placeholders = ", ".join("?" for _ in post_ids)
+        sql = f"UPDATE posts SET {assignments} WHERE id IN ({placeholders})"
+        params = list(row.values()) + post_ids
+        if if_updated_at is not None:
+            sql += " AND updated_at = ?"
+            params.append(self.normalize_timestamp(if_updated_at))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Collect the matched ids first, since the update may change updated_at
+                match_sql = f"SELECT id FROM posts WHERE id IN ({placeholders})"
+                match_params = list(post_ids)
+                if if_updated_at is not None:
+                    match_sql += " AND updated_at = ?"
+                    match_params.append(self.normalize_timestamp(if_updated_at))
+                matched = [r[0] for r in self._conn.execute(match_sql, match_params).fetchall()]
+                if row and matched:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._select_ids(matched) if matched else []
+
+    def delete_posts(self, post_ids):
+        post_ids = [str(post_id) for post_id in post_ids]
+        if not post_ids:
+            return []
+        placeholders = ", ".join("?" for _ in post_ids)
+        with self._lock:
+            deleted = self._select_ids(post_ids)
+            self._conn.execute(f"DELETE FROM posts WHERE id IN ({placeholders})", post_ids)
+            return deleted
+
+    def append_media(self, post_id, media):
+        with self._lock:
+            # The write lock makes the read-modify-write atomic across processes too
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT media FROM posts WHERE id = ?", (str(post_id),)).fetchone()
+                if row is None:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                current = json.loads(row[0]) if row[0] else []
+                self._conn.execute(
+                    "UPDATE posts SET media = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(current + list(media)), datetime.now(timezone.utc).isoformat(), str(post_id))
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self.get_post(post_id)
+
+    def check_connection(self):
+        with self._lock:
+            self._conn.execute("SELECT id FROM posts LIMIT 1").fetchall()
+
+    def load_csv(self, csv_path: Union[str, Path]) -> int:
+        """Bulk-load a Supabase CSV export such as posts_rows.csv, replacing rows with the same id
+
+        Returns:
+            Number of rows loaded
+        """
+        posts = []
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                post = {key: (value if value != "" else None) for key, value in record.items() if key in POST_COLUMNS}
+                post["tags"] = json.loads(post["tags"]) if post.get("tags") else []
+                post["media"] = json.loads(post["media"]) if post.get("media") else []
+                post["published"] = str(post.get("published")).lower() == "true"
+                posts.append(post)
+        return self.upsert_posts(posts)
+
+    def upsert_posts(self, posts: Sequence[Dict]) -> int:
+        """Insert or replace complete rows as-is, keeping their ids and timestamps
+
+        Used to load exports and to apply synced rows to a replica.
+
+        Returns:
+            Number of rows written
+        """
+        rows = [self._new_row(post) for post in posts]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO posts ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})",
+                        list(row.values())
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def all_ids(self) -> List[str]:
+        """Get the id of every stored post"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM posts")]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the database's key/value meta table"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        """Write a value to the database's key/value meta table"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _file_path(self, bucket: str, path: str) -> Path:
+        full_path = (self.storage_dir / bucket / path).resolve()
+        if self.storage_dir.resolve() not in full_path.parents:
+            raise ValueError(f"Invalid storage path: {path}")
+        return full_path
+
+    def upload_file(self, bucket, path, file, file_options=None):
+        if isinstance(file, (str, Path)):
+            data = Path(file).read_bytes()
+        elif isinstance(file, bytes):
+            data = file
+        else:
+            data = file.read()
+        full_path = self._file_path(bucket, path)
+        upsert = str((file_options or {}).get("upsert", "false")).lower() == "true"
+        if full_path.exists() and not upsert:
+            raise FileExistsError(f"{bucket}/{path} already exists")
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+        return {"path": path}
+
+    def remove_files(self, bucket, paths):
+        for path in paths:
+            self._file_path(bucket, path).unlink(missing_ok=True)
+
+    def list_files(self, bucket, folder, limit=None):
+        folder_path = self._file_path(bucket, folder) if folder else self.storage_dir / bucket
+        if not folder_path.is_dir():
+            return []
+        files = [{"name": entry.name} for entry in sorted(folder_path.iterdir())]
+        return files[:limit] if limit else files
+
+    def get_public_url(self, bucket, path):
+        # A local path works anywhere the app displays images (st.image accepts paths)
+        return str(self._file_path(bucket, path))
+
+    def create_signed_url(self, bucket, path, expires_in):
+        return self.get_public_url(bucket, path)
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_supabase_client():
+    """Get the process-wide Supabase client, creating it on first use
+
+    Every client built from the default credentials shares this one, so the app
+    pays for one set of HTTP connections instead of one per page.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                from supabase import create_client
+                _shared_client = create_client(
+                    supabase_url=st.secrets["SUPABASE_URL"],
+                    supabase_key=st.secrets["SUPABASE_KEY"]
+                )
+    return _shared_client
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+def create_backend() -> PostBackend:
+    """Create the backend selected by the BLOG_BACKEND setting ("supabase", "sqlite" or "replica")
+
+    The SQLite backend reads BLOG_SQLITE_PATH and BLOG_STORAGE_DIR, and seeds an
+    empty database from BLOG_SEED_CSV (posts_rows.csv by default). The replica
+    backend reads from the local replica at BLOG_REPLICA_PATH and writes to Supabase.
+    """
+    kind = (get_setting("BLOG_BACKEND", "supabase") or "supabase").lower()
+    if kind == "supabase":
+        return SupabaseBackend()
+    if kind == "replica":
+        from utils.sync import ReplicaBackend, get_replica
+        return ReplicaBackend(SupabaseBackend(), get_replica())
+    if kind == "sqlite":
+        backend = SQLiteBackend(
+            get_setting("BLOG_SQLITE_PATH", str(ROOT_DIR / ".cache" / "posts.db")),
+            get_setting("BLOG_STORAGE_DIR", str(ROOT_DIR / ".cache" / "storage"))
+        )
+        seed_csv = get_setting("BLOG_SEED_CSV", str(ROOT_DIR / "posts_rows.csv"))
+        if seed_csv and Path(seed_csv).exists() and backend.count_posts() == 0:
+            backend.load_csv(seed_csv)
+        return backend
+    raise ValueError(f"Unknown BLOG_BACKEND: {kind}")
+
+def get_backend() -> PostBackend:
+    """Get the process-wide backend, creating it on first use"""
+    global _default_backend
+    if _default_backend is None:
+        with _default_backend_lock:
+            if _default_backend is None:
+                _default_backend = create_backend()
+    return _default_backend
@@ -0,0 +1,126 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.backends import ROOT_DIR, get_setting
+
+def new_run_id() -> str:
+    """A sortable, unique run ID like 20250114-153012-1a2b3c"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+def runs_dir() -> Path:
+    return Path(get_setting("BLOG_RUNS_DIR", str(ROOT_DIR / "runs")))
+
+class RunCheckpoint:
+    """Task results of one generation, saved to runs/<run_id>/ as each task finishes
+
+    A failed save or a bad metadata response then costs a resume rather than a
+    whole new research/analysis/writing run. The manifest keeps the inputs the
+    run was started with, so a resume only needs the run ID.
+    """
+
+    def __init__(self, run_id: str, root: Optional[Union[str, Path]] = None):
+        self.run_id = run_id
+        self.path = Path(root or runs_dir()) / run_id
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def start(cls, query: str, analysis_depth: str, research_mode: str, compress: bool = False,
+              compress_max_tokens: Optional[int] = None, run_id: Optional[str] = None,
+              root: Optional[Union[str, Path]] = None) -> "RunCheckpoint":
+        """Create a checkpoint directory for a new run, under `run_id` if the caller picked one"""
+        checkpoint = cls(run_id or new_run_id(), root)
+        checkpoint.write_manifest({
+            "run_id": checkpoint.run_id,
+            "query": query,
+            "analysis_depth": analysis_depth,
+            "research_mode": research_mode,
+            "compress": compress,
+            "compress_max_tokens": compress_max_tokens,
+            "created_at": datetime.now().isoformat(),
+            "post_id": None
+        })
+        return checkpoint
+
+    @staticmethod
+    def exists(run_id: str, root: Optional[Union[str, Path]] = None) -> bool:
+        """Whether a run was started under this ID"""
+        return (Path(root or runs_dir()) / run_id / "manifest.json").exists()
+
+    @classmethod
+    def open(cls, run_id: str, root: Optional[Union[str, Path]] = None) -> "RunCheckpoint":
+        """Open an existing run, raising if it was never started"""
+        if not cls.exists(run_id, root):
+            raise Exception(f"Error resuming run: no checkpoint found at {Path(root or runs_dir()) / run_id}")
+        return cls(run_id, root)
+
+    def _write(self, path: Path, data: Dict):
+        # Write then rename so a crash never leaves a half-written checkpoint
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @property
+    def manifest(self) -> Dict:
+        return json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+
+    def write_manifest(self, manifest: Dict):
+        self._write(self.path / "manifest.json", manifest)
+
+    def update_manifest(self, **fields):
+        self.write_manifest({**self.manifest, **fields})
+
+    def save(self, task, seconds: Optional[float] = None):
+        """Store a finished task's output"""
+        if task.result is None:
+            return
+        self._write(self.path / f"{task.name}.json", {
+            "name": task.name,
+            "agent": task.agent.name,
+            "raw": task.result.raw,
+            "seconds": seconds,
+            "saved_at": datetime.now().isoformat()
+        })
+
+    def load(self, name: str) -> Optional[Dict]:
+        path = self.path / f"{name}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def restore(self, task) -> bool:
+        """Fill in a task's result from its checkpoint
+
+        Returns:
+            True if the task had a checkpoint and no longer needs to run
+        """
+        from praisonaiagents.main import TaskOutput
+
+        saved = self.load(task.name)
+        if saved is None:
+            return False
+        task.result = TaskOutput(description=task.description, raw=saved["raw"], agent=saved["agent"])
+        task.status = "completed"
+        return True
+
+    def discard(self, names: Iterable[str]):
+        """Drop task checkpoints so those tasks run again"""
+        for name in names:
+            (self.path / f"{name}.json").unlink(missing_ok=True)
+
+    def completed(self) -> List[str]:
+        return sorted(path.stem for path in self.path.glob("*.json") if path.stem != "manifest")
+
+def downstream_of(tasks: List, names: Iterable[str]) -> List[str]:
+    """Names of the given tasks plus every task that depends on them, in run order
+
+    `tasks` must be in dependency order, as run_workflow builds them.
+    """
+    stale = set(names)
+    for task in tasks:
+        if any(getattr(item, "name", None) in stale for item in task.context or []):
+            stale.add(task.name)
+    return [task.name for task in tasks if task.name in stale]
@@ -1,10 +1,27 @@
-from supabase import create_client, Client
 import os
-import streamlit as st
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Union, BinaryIO, Any
+from typing import Dict, List, Optional, Union, BinaryIO, Any, Sequence, Tuple
 from pydantic import BaseModel
 from pathlib import Path
+from utils.backends import (
+    PostBackend, SupabaseBackend, ConcurrentUpdateError, get_backend
+)
+from utils.search import PostSearchIndex, get_search_index
+from utils.similarity import TopicIndex, TopicMatch, duplicate_threshold
+
+# Maximum number of ids/rows sent in one bulk request, keeps URLs and payloads bounded
+BULK_CHUNK_SIZE = 200
+
+# Lightweight projection used by listing pages; leaves out the markdown `content`
+POST_SUMMARY_COLUMNS = [
+    "id", "title", "description", "type", "tags", "thumbnail",
+    "published", "date", "created_at", "updated_at"
+]
 
 class MediaContent(BaseModel):
     """Model for media content in blog posts"""
@@ -13,13 +30,107 @@ class MediaContent(BaseModel):
     caption: Optional[str] = None
     alt_text: Optional[str] = None
 
+class PostCache:
+    """Read-through cache for post reads with a TTL, LRU eviction and hit/miss counters.
+    
+    Single posts are keyed by ("post", post_id) and listings by ("list", ...query params).
+    A write to any post drops that post's entry and every cached listing, since any
+    listing may contain the changed row.
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, counting the lookup as a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Hand out copies so callers can't mutate the cached rows
+            return True, copy.deepcopy(entry[1])
+
+    def set(self, key: Tuple, value: Any):
+        """Store a value, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_post(self, post_id: Optional[str] = None):
+        """Drop a post's entry (if given) and all cached listings"""
+        with self._lock:
+            if post_id is not None:
+                self._entries.pop(("post", str(post_id)), None)
+            for key in [key for key in self._entries if key[0] == "list"]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Shared by every client in the process so Streamlit reruns and sessions reuse reads
+post_cache = PostCache(
+    max_entries=int(os.getenv("POST_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("POST_CACHE_TTL_SECONDS", "60"))
+)
+
+def _index_posts(search_index: Optional[PostSearchIndex], posts: List[Dict]):
+    """Keep the search index in step with a write; index failures never fail the write"""
+    if search_index is None:
+        return
+    try:
+        search_index.upsert_posts(posts)
+    except Exception as e:
+        print(f"Warning: could not update search index: {str(e)}")
+
+def _unindex_posts(search_index: Optional[PostSearchIndex], post_ids: Sequence[str]):
+    """Drop deleted posts from the search index; index failures never fail the delete"""
+    if search_index is None:
+        return
+    try:
+        search_index.remove_posts(post_ids)
+    except Exception as e:
+        print(f"Warning: could not update search index: {str(e)}")
+
 class BlogPostDB:
-    def __init__(self):
-        """Initialize Supabase client with existing configuration"""
-        self.supabase = create_client(
-            supabase_url=st.secrets["SUPABASE_URL"],
-            supabase_key=st.secrets["SUPABASE_KEY"]
-        )
+    def __init__(self, backend: Optional[PostBackend] = None, search_index: Optional[PostSearchIndex] = None):
+        """Initialize with the configured storage backend, connecting on first query
+        
+        Args:
+            backend: Backend to use instead of the process-wide one from BLOG_BACKEND
+            search_index: Search index to keep updated. Defaults to the shared index
+                for the process-wide backend and none for an explicit backend.
+        """
+        self.backend = backend or get_backend()
+        self.cache = post_cache if backend is None else PostCache()
+        self.search_index = search_index or (get_search_index() if backend is None else None)
 
     def save_blog_post(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
         """Save a new blog post to the database
@@ -39,8 +150,10 @@ class BlogPostDB:
             Dict containing the saved blog post data with ID
         """
         try:
-            response = self.supabase.table("posts").insert(post_data).execute()
-            return response.data[0] if response.data else {}
+            rows = self.backend.insert_posts([post_data])
+            self.cache.invalidate_post()
+            _index_posts(self.search_index, rows)
+            return rows[0] if rows else {}
         except Exception as e:
             print(f"Error saving blog post: {str(e)}")
             raise
@@ -55,11 +168,14 @@ class BlogPostDB:
             List of blog post dictionaries
         """
         try:
-            query = self.supabase.table("posts")
-            if published_only:
-                query = query.eq("published", True)
-            response = query.order("created_at", desc=True).execute()
-            return response.data if response.data else []
+            cache_key = ("list", "BlogPostDB.get_blog_posts", published_only)
+            found, posts = self.cache.get(cache_key)
+            if found:
+                return posts
+            
+            posts = self.backend.list_posts(published=True if published_only else None)
+            self.cache.set(cache_key, posts)
+            return posts
         except Exception as e:
             print(f"Error fetching blog posts: {str(e)}")
             return []
@@ -74,8 +190,14 @@ class BlogPostDB:
             Blog post dictionary if found, None otherwise
         """
         try:
-            response = self.supabase.table("posts").select("*").eq("id", post_id).execute()
-            return response.data[0] if response.data else None
+            found, post = self.cache.get(("post", str(post_id)))
+            if found:
+                return post
+            
+            post = self.backend.get_post(post_id)
+            if post:
+                self.cache.set(("post", str(post_id)), post)
+            return post
         except Exception as e:
             print(f"Error fetching blog post: {str(e)}")
             return None
@@ -91,8 +213,10 @@ class BlogPostDB:
             Updated blog post dictionary if successful, None otherwise
         """
         try:
-            response = self.supabase.table("posts").update(updates).eq("id", post_id).execute()
-            return response.data[0] if response.data else None
+            rows = self.backend.update_posts([post_id], updates)
+            self.cache.invalidate_post(post_id)
+            _index_posts(self.search_index, rows)
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error updating blog post: {str(e)}")
             return None
@@ -124,53 +248,85 @@ class BlogPostDB:
             return None
 
 class DatabaseClient:
-    def __init__(self, url: str = None, key: str = None):
-        """Initialize Supabase client with URL and key"""
-        self.connection_status = "Initializing"
-        self.storage_status = "Initializing"
+    def __init__(
+        self,
+        url: str = None,
+        key: str = None,
+        client=None,
+        backend: Optional[PostBackend] = None,
+        search_index: Optional[PostSearchIndex] = None
+    ):
+        """Initialize the database client without touching the network
         
-        # Get credentials from Streamlit secrets
-        self.url = url or st.secrets["SUPABASE_URL"]
-        self.key = key or st.secrets["SUPABASE_KEY"]
+        Nothing connects until the first query, and the connection/storage checks
+        only run when get_status() or check_connection() is called.
         
-        if not self.url or not self.key:
+        Args:
+            url: Supabase project URL. Defaults to the configured backend.
+            key: Supabase API key. Defaults to the configured backend.
+            client: An existing Supabase client (or a local stand-in with the same interface)
+            backend: A storage backend to use, e.g. SQLiteBackend for offline use
+            search_index: Search index to keep updated. Defaults to the shared index
+                for the process-wide backend and none otherwise.
+        """
+        self.connection_status = "Not checked"
+        self.storage_status = "Not checked"
+        
+        if client is None and backend is None and bool(url) != bool(key):
             self.connection_status = "Error: Missing credentials"
             raise ValueError("Supabase URL and key are required")
-            
+        
+        if backend is not None:
+            self.backend = backend
+        elif client is not None or url:
+            self.backend = SupabaseBackend(url=url, key=key, client=client)
+        else:
+            self.backend = get_backend()
+        
+        # Only the process-wide backend shares the process-wide cache
+        explicit = backend is not None or client is not None or bool(url)
+        self.cache = PostCache() if explicit else post_cache
+        self.search_index = search_index or (None if explicit else get_search_index())
+        self._topic_index = None
+
+    @property
+    def client(self):
+        """The underlying Supabase client, for Supabase backends"""
+        return self.backend.client
+
+    def check_connection(self):
+        """Verify database and storage access, updating the status fields"""
         try:
-            self.client = create_client(self.url, self.key)
-            self.connection_status = "Connecting"
-            
-            # Verify connection by trying to access the database
-            try:
-                # Try a simple query to verify connection
-                self.client.table('posts').select("count", count='exact').execute()
-                self.connection_status = "Connected"
-            except Exception as db_e:
-                self.connection_status = f"Warning: Connection issues - {str(db_e)}"
-            
-        except Exception as e:
-            self.connection_status = f"Error: Failed to connect - {str(e)}"
-            raise
+            self.backend.check_connection()
+            self.connection_status = f"Connected ({self.backend.name})"
+        except Exception as db_e:
+            self.connection_status = f"Warning: Connection issues - {str(db_e)}"
         
         self._ensure_storage_bucket()
 
     def _ensure_storage_bucket(self):
         """Verify access to the blog-assets/blog-images storage path"""
         try:
-            # Use from_ to access the bucket and list contents of the blog-images folder
-            files = self.client.storage.from_('blog-assets').list('blog-images')
-            self.storage_status = f"Storage accessible ({len(files)} files found)"
+            # One entry is enough to prove access
+            self.backend.list_files('blog-assets', 'blog-images', limit=1)
+            self.storage_status = "Storage accessible"
         except Exception as e:
             self.storage_status = f"Warning: Storage access issues - {str(e)}"
 
     def get_status(self):
-        """Get the current status of database connections"""
+        """Get the current status of database connections, checking them on first call"""
+        if self.connection_status == "Not checked":
+            self.check_connection()
         return {
             "connection": self.connection_status,
-            "storage": self.storage_status
+            "storage": self.storage_status,
+            "cache": self.get_cache_stats()
         }
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the post cache"""
+        return self.cache.stats()
+
     def upload_media(self, file: Union[BinaryIO, bytes, str, Path], file_path: str) -> str:
         """Upload media file to storage and return public URL"""
         try:
@@ -178,15 +334,15 @@ class DatabaseClient:
             full_path = f"blog-images/{file_path}"
             
             # Upload the file
-            response = self.client.storage.from_('blog-assets').upload(
-                path=full_path,
-                file=file,
+            self.backend.upload_file(
+                'blog-assets',
+                full_path,
+                file,
                 file_options={"cache-control": "3600", "upsert": "true"}
             )
             
             # Get the public URL
-            public_url = self.client.storage.from_('blog-assets').get_public_url(full_path)
-            return public_url
+            return self.backend.get_public_url('blog-assets', full_path)
         except Exception as e:
             raise Exception(f"Error uploading media: {str(e)}")
 
@@ -195,7 +351,7 @@ class DatabaseClient:
         try:
             # Ensure the file path includes the blog-images folder
             full_path = f"blog-images/{file_path}"
-            self.client.storage.from_('blog-assets').remove([full_path])
+            self.backend.remove_files('blog-assets', [full_path])
         except Exception as e:
             raise Exception(f"Error deleting media: {str(e)}")
 
@@ -213,48 +369,195 @@ class DatabaseClient:
                 "media": [media.dict() for media in post.media] if post.media else []
             }
             
-            response = (self.client.table("posts")
-                       .insert(data)
-                       .execute())
+            rows = self.backend.insert_posts([data])
+            self.cache.invalidate_post()
+            _index_posts(self.search_index, rows)
             
-            return response.data[0] if response.data else None
+            return rows[0] if rows else None
         except Exception as e:
             raise Exception(f"Error saving blog post: {str(e)}")
 
-    def get_blog_posts(self, published_only: bool = False) -> List[Dict]:
+    def get_blog_posts(self, published_only: bool = False, columns: Optional[Sequence[str]] = None) -> List[Dict]:
         """Get all blog posts
         
         Args:
             published_only (bool): If True, only return published posts. If False, return all posts.
+            columns: Columns to select. Defaults to every column; pass POST_SUMMARY_COLUMNS
+                to skip the post content.
         """
         try:
-            query = self.client.table("posts").select("*")
-            if published_only:
-                query = query.eq("published", True)
-            response = query.order("date", desc=True).execute()
-            return response.data if response.data else []
+            cache_key = ("list", "get_blog_posts", published_only, tuple(columns or ()))
+            found, posts = self.cache.get(cache_key)
+            if found:
+                return posts
+            
+            posts = self.backend.list_posts(
+                columns=columns,
+                published=True if published_only else None,
+                order_by="date"
+            )
+            self.cache.set(cache_key, posts)
+            return posts
         except Exception as e:
             raise Exception(f"Error fetching blog posts: {str(e)}")
 
+    def get_blog_posts_page(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        published: Optional[bool] = None,
+        page_size: int = 25,
+        cursor: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict[str, str]]]:
+        """Get one page of blog posts using keyset pagination on (created_at, id)
+        
+        Args:
+            columns: Columns to select. Defaults to POST_SUMMARY_COLUMNS.
+            published: True for published posts, False for drafts, None for both.
+            page_size: Maximum number of posts to return.
+            cursor: The cursor returned with the previous page, or None for the first page.
+            
+        Returns:
+            Tuple of (posts, next_cursor). next_cursor is None on the last page.
+        """
+        try:
+            columns = list(columns or POST_SUMMARY_COLUMNS)
+            # The cursor is built from these, so they always have to come back
+            for key in ("id", "created_at"):
+                if key not in columns:
+                    columns.append(key)
+            
+            cache_key = (
+                "list", "get_blog_posts_page", tuple(columns), published, page_size,
+                (cursor["created_at"], cursor["id"]) if cursor else None
+            )
+            found, page = self.cache.get(cache_key)
+            if found:
+                return page
+            
+            # Fetch one extra row to find out whether there is a next page
+            posts = self.backend.list_posts(
+                columns=columns,
+                published=published,
+                order_by="created_at",
+                limit=page_size + 1,
+                cursor=(cursor["created_at"], cursor["id"]) if cursor else None
+            )
+            
+            next_cursor = None
+            if len(posts) > page_size:
+                posts = posts[:page_size]
+                last = posts[-1]
+                next_cursor = {"created_at": last["created_at"], "id": last["id"]}
+            
+            self.cache.set(cache_key, (posts, next_cursor))
+            return posts, next_cursor
+        except Exception as e:
+            raise Exception(f"Error fetching blog posts page: {str(e)}")
+
+    def count_blog_posts(self, published: Optional[bool] = None) -> int:
+        """Count blog posts without transferring any rows
+        
+        Args:
+            published: True for published posts, False for drafts, None for both.
+        """
+        try:
+            cache_key = ("list", "count_blog_posts", published)
+            found, count = self.cache.get(cache_key)
+            if found:
+                return count
+            
+            count = self.backend.count_posts(published)
+            self.cache.set(cache_key, count)
+            return count
+        except Exception as e:
+            raise Exception(f"Error counting blog posts: {str(e)}")
+
+    def search_posts(
+        self,
+        query: str,
+        tags: Optional[Sequence[str]] = None,
+        published: Optional[bool] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """Full-text search over post title, description, content and tags
+        
+        The index is built from the backend on first use and kept current by this
+        client's writes afterwards.
+        
+        Args:
+            query: Free text to search for
+            tags: Only return posts that have all of these tags
+            published: True for published posts, False for drafts, None for both
+            limit: Maximum number of results
+            
+        Returns:
+            Ranked list of post summaries with highlighted `snippet`s
+        """
+        if self.search_index is None:
+            raise Exception("Search is not enabled for this client")
+        try:
+            self.search_index.ensure_built(self.backend)
+            return self.search_index.search(query, tags=tags, published=published, limit=limit)
+        except Exception as e:
+            raise Exception(f"Error searching blog posts: {str(e)}")
+
+    def find_similar_posts(self, topic: str, limit: int = 3, threshold: Optional[float] = None) -> List[TopicMatch]:
+        """Existing posts that already cover a topic, for warning before a generation
+        
+        Uses TF-IDF vectors over the local search index, so it answers in
+        milliseconds without an LLM call once the index is built.
+        
+        Args:
+            topic: Topic about to be generated
+            limit: Maximum number of matches
+            threshold: Minimum similarity, defaulting to BLOG_DUPLICATE_THRESHOLD
+            
+        Returns:
+            Matching posts with their similarity score, closest first
+        """
+        if self.search_index is None:
+            return []
+        try:
+            self.search_index.ensure_built(self.backend)
+            if self._topic_index is None:
+                self._topic_index = TopicIndex(self.search_index)
+            return self._topic_index.similar(
+                topic, limit=limit, threshold=duplicate_threshold() if threshold is None else threshold
+            )
+        except Exception as e:
+            raise Exception(f"Error checking for similar posts: {str(e)}")
+
+    def get_search_tags(self) -> List[str]:
+        """Get every tag known to the search index, for tag filters"""
+        if self.search_index is None:
+            return []
+        self.search_index.ensure_built(self.backend)
+        return self.search_index.all_tags()
+
     def get_blog_post(self, post_id: str) -> Optional[Dict]:
         """Get a specific blog post by ID"""
         try:
-            response = (self.client.table("posts")
-                       .select("*")
-                       .eq("id", post_id)
-                       .execute())
-            return response.data[0] if response.data else None
+            found, post = self.cache.get(("post", str(post_id)))
+            if found:
+                return post
+            
+            post = self.backend.get_post(post_id)
+            if post:
+                self.cache.set(("post", str(post_id)), post)
+            return post
         except Exception as e:
             raise Exception(f"Error fetching blog post: {str(e)}")
 
-    def update_blog_post(self, post_id: str, updates: Dict) -> Dict:
-        """Update a blog post"""
+    def update_blog_post(self, post_id: str, updates: Dict, if_updated_at: Optional[str] = None) -> Dict:
+        """Update a blog post
+        
+        Args:
+            post_id: The ID of the blog post to update
+            updates: Dictionary containing fields to update
+            if_updated_at: Only apply the update if the post's updated_at still has this
+                value, raising ConcurrentUpdateError otherwise
+        """
         try:
-            # Ensure post exists
-            existing_post = self.get_blog_post(post_id)
-            if not existing_post:
-                raise Exception(f"Blog post with ID {post_id} not found")
-            
             # If updating media content, ensure proper format
             if "media" in updates and updates["media"]:
                 if isinstance(updates["media"], list):
@@ -263,63 +566,151 @@ class DatabaseClient:
                         for media in updates["media"]
                     ]
             
-            response = (self.client.table("posts")
-                       .update(updates)
-                       .eq("id", post_id)
-                       .execute())
+            if if_updated_at is not None:
+                # The precondition only works if every conditional write moves updated_at
+                updates = {"updated_at": datetime.now().isoformat(), **updates}
+            
+            # The update returns the row, so an empty result means no row matched
+            rows = self.backend.update_posts([post_id], updates, if_updated_at=if_updated_at)
+            self.cache.invalidate_post(post_id)
+            _index_posts(self.search_index, rows)
+            if not rows:
+                if if_updated_at is not None:
+                    raise ConcurrentUpdateError(
+                        f"Blog post with ID {post_id} was changed or deleted since {if_updated_at}"
+                    )
+                raise Exception(f"Blog post with ID {post_id} not found")
             
-            return response.data[0] if response.data else None
+            return rows[0]
+        except ConcurrentUpdateError:
+            raise
         except Exception as e:
             raise Exception(f"Error updating blog post: {str(e)}")
 
     def toggle_publish_status(self, post_id: str, publish: bool) -> Dict:
         """Toggle the published status of a blog post"""
         try:
-            # Get existing post
-            existing_post = self.get_blog_post(post_id)
-            if not existing_post:
+            rows = self.backend.update_posts(
+                [post_id],
+                {"published": publish, "updated_at": datetime.now().isoformat()}
+            )
+            self.cache.invalidate_post(post_id)
+            _index_posts(self.search_index, rows)
+            if not rows:
                 raise Exception(f"Blog post with ID {post_id} not found")
             
-            # Only update if status is different
-            if existing_post.get("published") != publish:
-                response = (self.client.table("posts")
-                           .update({"published": publish})
-                           .eq("id", post_id)
-                           .execute())
-                
-                return response.data[0] if response.data else None
-            
-            return existing_post
+            return rows[0]
         except Exception as e:
             raise Exception(f"Error toggling publish status: {str(e)}")
 
-    def add_media_to_post(self, post_id: str, media: Union[MediaContent, List[MediaContent]]) -> Dict:
-        """Add media content to a blog post"""
-        try:
-            existing_post = self.get_blog_post(post_id)
-            if not existing_post:
-                raise Exception(f"Blog post with ID {post_id} not found")
+    def bulk_set_published(self, post_ids: Sequence[str], publish: bool) -> List[Dict]:
+        """Set the published status of many posts with one filtered update per chunk
+        
+        Args:
+            post_ids: IDs of the posts to update
+            publish: The published status to set
+            
+        Returns:
+            List of the updated posts
+        """
+        return self._bulk_update_ids(
+            post_ids,
+            {"published": publish, "updated_at": datetime.now().isoformat()},
+            "setting publish status"
+        )
+
+    def bulk_update(self, patches: Sequence[Dict]) -> List[Dict]:
+        """Apply many partial updates, each a dict with an "id" plus the fields to change
+        
+        Patches that change the same fields to the same values are merged into a
+        single filtered `in` update, so uniform batches cost one request per chunk.
+        
+        Args:
+            patches: List of dicts like {"id": ..., "published": True}
             
-            current_media = existing_post.get("media", [])
+        Returns:
+            List of the updated posts
+        """
+        groups = {}
+        for patch in patches:
+            updates = {key: value for key, value in patch.items() if key != "id"}
+            if "media" in updates and isinstance(updates["media"], list):
+                updates["media"] = [
+                    media.dict() if isinstance(media, MediaContent) else media
+                    for media in updates["media"]
+                ]
+            group_key = json.dumps(updates, sort_keys=True, default=str)
+            groups.setdefault(group_key, (updates, []))[1].append(patch["id"])
+        
+        updated = []
+        for updates, post_ids in groups.values():
+            updated.extend(self._bulk_update_ids(post_ids, updates, "applying bulk update"))
+        return updated
+
+    def bulk_insert(self, posts: Sequence[Dict]) -> List[Dict]:
+        """Insert many posts with one request per chunk
+        
+        Args:
+            posts: List of post data dicts (title, content, description, etc.)
             
+        Returns:
+            List of the created posts
+        """
+        try:
+            created = []
+            for start in range(0, len(posts), BULK_CHUNK_SIZE):
+                created.extend(self.backend.insert_posts(list(posts[start:start + BULK_CHUNK_SIZE])))
+            self.cache.invalidate_post()
+            _index_posts(self.search_index, created)
+            return created
+        except Exception as e:
+            self.cache.invalidate_post()
+            raise Exception(f"Error inserting blog posts: {str(e)}")
+
+    def _bulk_update_ids(self, post_ids: Sequence[str], updates: Dict, action: str) -> List[Dict]:
+        """Apply the same updates to many posts using `id in (...)` filters"""
+        try:
+            updated = []
+            post_ids = list(post_ids)
+            for start in range(0, len(post_ids), BULK_CHUNK_SIZE):
+                chunk = post_ids[start:start + BULK_CHUNK_SIZE]
+                updated.extend(self.backend.update_posts(chunk, updates))
+                for post_id in chunk:
+                    self.cache.invalidate_post(post_id)
+            _index_posts(self.search_index, updated)
+            return updated
+        except Exception as e:
+            self.cache.invalidate_post()
+            raise Exception(f"Error {action}: {str(e)}")
+
+    def add_media_to_post(self, post_id: str, media: Union[MediaContent, List[MediaContent]]) -> Dict:
+        """Add media content to a blog post
+        
+        The backend appends in a single atomic operation (the append_post_media
+        function on Supabase), so concurrent appends can't overwrite each other.
+        """
+        try:
             # Convert single media to list
             if isinstance(media, MediaContent):
                 media = [media]
+            new_media = [m.dict() if isinstance(m, MediaContent) else m for m in media]
             
-            # Add new media
-            new_media = current_media + [m.dict() for m in media]
-            
-            response = (self.client.table("posts")
-                       .update({"media": new_media})
-                       .eq("id", post_id)
-                       .execute())
+            try:
+                post = self.backend.append_media(post_id, new_media)
+            finally:
+                self.cache.invalidate_post(post_id)
             
-            return response.data[0] if response.data else None
+            if not post:
+                raise Exception(f"Blog post with ID {post_id} not found")
+            _index_posts(self.search_index, [post])
+            return post
+        except ConcurrentUpdateError:
+            raise
         except Exception as e:
             raise Exception(f"Error adding media to post: {str(e)}")
 
     def upload_post_image(self, file_path: str, file_data: bytes) -> str:
-        """Upload an image for a post to Supabase storage.
+        """Upload an image for a post to storage.
         
         Args:
             file_path: The path where the file should be stored (e.g. 'posts/image1.png')
@@ -329,14 +720,14 @@ class DatabaseClient:
             str: The URL of the uploaded image
         """
         try:
-            response = self.client.storage.from_("posts").upload(
-                path=file_path,
-                file=file_data,
-                file_options={"content-type": "image/*", "upsert": True}
+            self.backend.upload_file(
+                "posts",
+                file_path,
+                file_data,
+                file_options={"content-type": "image/*", "upsert": "true"}
             )
             # Get public URL for the uploaded image
-            image_url = self.client.storage.from_("posts").get_public_url(file_path)
-            return image_url
+            return self.backend.get_public_url("posts", file_path)
         except Exception as e:
             print(f"Error uploading image: {str(e)}")
             raise
@@ -352,8 +743,10 @@ class DatabaseClient:
             dict: The updated post data
         """
         try:
-            response = self.client.table("posts").update(updates).eq("id", post_id).execute()
-            return response.data[0] if response.data else None
+            rows = self.backend.update_posts([post_id], updates)
+            self.cache.invalidate_post(post_id)
+            _index_posts(self.search_index, rows)
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error updating post: {str(e)}")
             raise
@@ -368,8 +761,14 @@ class DatabaseClient:
             dict: The post data
         """
         try:
-            response = self.client.table("posts").select("*").eq("id", post_id).execute()
-            return response.data[0] if response.data else None
+            found, post = self.cache.get(("post", str(post_id)))
+            if found:
+                return post
+            
+            post = self.backend.get_post(post_id)
+            if post:
+                self.cache.set(("post", str(post_id)), post)
+            return post
         except Exception as e:
             print(f"Error getting post: {str(e)}")
             raise
@@ -384,8 +783,10 @@ class DatabaseClient:
             dict: The created post data
         """
         try:
-            response = self.client.table("posts").insert(post_data).execute()
-            return response.data[0] if response.data else None
+            rows = self.backend.insert_posts([post_data])
+            self.cache.invalidate_post()
+            _index_posts(self.search_index, rows)
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error creating post: {str(e)}")
             raise
@@ -400,16 +801,18 @@ class DatabaseClient:
             bool: True if successful, False otherwise
         """
         try:
-            # Get post to check for image
-            post = self.get_post(post_id)
+            # The delete returns the deleted row, so the thumbnail comes from the row as it
+            # was at deletion rather than from a possibly stale cached copy
+            deleted = self.backend.delete_posts([post_id])
+            self.cache.invalidate_post(post_id)
+            _unindex_posts(self.search_index, [post_id])
+            
+            post = deleted[0] if deleted else None
             if post and post.get('thumbnail_url'):
                 # Extract filename from URL and delete from storage
                 file_path = post['thumbnail_url'].split('/')[-1]
-                self.client.storage.from_("posts").remove([f"posts/{file_path}"])
-            
-            # Delete the post
-            response = self.client.table("posts").delete().eq("id", post_id).execute()
-            return bool(response.data)
+                self.backend.remove_files("posts", [f"posts/{file_path}"])
+            return bool(deleted)
         except Exception as e:
             print(f"Error deleting post: {str(e)}")
             raise
@@ -425,17 +828,22 @@ class DatabaseClient:
             str: The signed URL
         """
         try:
-            response = self.client.storage.from_("posts").create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
-            return response['signedURL']
+            return self.backend.create_signed_url("posts", file_path, expires_in)
         except Exception as e:
             print(f"Error getting signed URL: {str(e)}")
             raise
 
-# Create a singleton instance
-db = DatabaseClient(
-    url=st.secrets["SUPABASE_URL"],
-    key=st.secrets["SUPABASE_KEY"]
-) 
\ No newline at end of file
+_default_db = None
+_default_db_lock = threading.Lock()
+
+def get_db() -> DatabaseClient:
+    """Get the process-wide DatabaseClient on the configured backend"""
+    global _default_db
+    if _default_db is None:
+        with _default_db_lock:
+            if _default_db is None:
+                _default_db = DatabaseClient()
+    return _default_db
+
+# Shared instance; cheap to create since nothing connects until the first query
+db = get_db()
@@ -0,0 +1,161 @@
+import json
+import time
+import sqlite3
+import threading
+import statistics
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from pydantic import BaseModel
+
+from utils.backends import ROOT_DIR, get_setting
+
+class DepthProfile(BaseModel):
+    """What an analysis depth setting spends on a generation"""
+    name: str
+    description: str
+    sub_questions: int
+    run_analysis: bool
+    # max_tokens for each stage's model calls (metadata shares the writing agent)
+    research_max_tokens: int
+    analysis_max_tokens: int
+    writing_max_tokens: int
+
+    def max_tokens_for(self, task_name: str) -> int:
+        return {
+            "research": self.research_max_tokens,
+            "analyze": self.analysis_max_tokens,
+            "write": self.writing_max_tokens,
+        }.get(task_name, self.writing_max_tokens)
+
+# The values app.py's analysis depth slider passes through to run_workflow
+DEPTH_PROFILES = {
+    "Basic": DepthProfile(
+        name="Basic",
+        description="2 searches, no separate analysis stage, shorter post",
+        sub_questions=2,
+        run_analysis=False,
+        research_max_tokens=1500,
+        analysis_max_tokens=0,
+        writing_max_tokens=3000
+    ),
+    "Detailed": DepthProfile(
+        name="Detailed",
+        description="3 searches, research, analysis and writing",
+        sub_questions=3,
+        run_analysis=True,
+        research_max_tokens=3000,
+        analysis_max_tokens=2000,
+        writing_max_tokens=6000
+    ),
+    "Comprehensive": DepthProfile(
+        name="Comprehensive",
+        description="5 searches, long research and analysis, full-length post",
+        sub_questions=5,
+        run_analysis=True,
+        research_max_tokens=6000,
+        analysis_max_tokens=4000,
+        writing_max_tokens=8192
+    ),
+}
+
+def get_depth_profile(analysis_depth: str) -> DepthProfile:
+    """Get the profile for a depth name, falling back to Detailed for unknown values"""
+    return DEPTH_PROFILES.get(analysis_depth, DEPTH_PROFILES["Detailed"])
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)"""
+    return len(text or "") // 4
+
+class RunHistory:
+    """Measured latency and token use of past generations, per depth profile
+
+    Every generation records its wall-clock time and token counts so the UI can
+    show what each depth has actually cost. Research (fanout mode), analysis,
+    compression and writing are direct Claude calls, so their token counts come
+    from the API's usage and are exact. Only the metadata stage and agent-mode
+    research run through the agent framework and are estimated from text length.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS generation_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            analysis_depth TEXT NOT NULL,
+            finished_at REAL NOT NULL,
+            seconds REAL NOT NULL,
+            input_tokens INTEGER NOT NULL,
+            output_tokens INTEGER NOT NULL,
+            stages TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_generation_runs_depth ON generation_runs (analysis_depth, finished_at);
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.executescript(self.SCHEMA)
+
+    def record(self, analysis_depth: str, seconds: float, stages: Dict[str, Dict]):
+        """Store one generation
+
+        Args:
+            analysis_depth: Profile name the run used
+            seconds: Wall-clock time of the whole generation
+            stages: Per-task dicts with seconds, input_tokens and output_tokens
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO generation_runs (analysis_depth, finished_at, seconds, input_tokens, output_tokens, stages) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (analysis_depth, time.time(), seconds,
+                 sum(stage.get("input_tokens", 0) for stage in stages.values()),
+                 sum(stage.get("output_tokens", 0) for stage in stages.values()),
+                 json.dumps(stages))
+            )
+
+    def summary(self, analysis_depth: str, last: int = 20) -> Optional[Dict]:
+        """Median seconds and tokens over the most recent runs at a depth, or None without runs"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seconds, input_tokens, output_tokens FROM generation_runs "
+                "WHERE analysis_depth = ? ORDER BY finished_at DESC LIMIT ?",
+                (analysis_depth, last)
+            ).fetchall()
+        if not rows:
+            return None
+        return {
+            "runs": len(rows),
+            "median_seconds": statistics.median(row[0] for row in rows),
+            "median_input_tokens": int(statistics.median(row[1] for row in rows)),
+            "median_output_tokens": int(statistics.median(row[2] for row in rows)),
+        }
+
+    def describe(self, analysis_depth: str) -> str:
+        """One line for the UI: the profile and what it has measured"""
+        profile = get_depth_profile(analysis_depth)
+        stats = self.summary(analysis_depth)
+        if stats is None:
+            return f"{profile.name}: {profile.description}. No runs measured yet."
+        return (
+            f"{profile.name}: {profile.description}. "
+            f"Typically {stats['median_seconds'] / 60:.1f} min, "
+            f"~{stats['median_input_tokens']:,} input / {stats['median_output_tokens']:,} output tokens "
+            f"(median of {stats['runs']} runs)"
+        )
+
+_default_history = None
+_default_history_lock = threading.Lock()
+
+def get_run_history() -> RunHistory:
+    """Get the process-wide run history stored at BLOG_RUN_HISTORY_PATH"""
+    global _default_history
+    if _default_history is None:
+        with _default_history_lock:
+            if _default_history is None:
+                _default_history = RunHistory(
+                    get_setting("BLOG_RUN_HISTORY_PATH", str(ROOT_DIR / ".cache" / "run_history.db"))
+                )
+    return _default_history
@@ -0,0 +1,257 @@
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from utils.backends import ROOT_DIR, get_setting
+from utils.checkpoints import new_run_id
+
+class JobQueue:
+    """Generation jobs and their progress events in a local SQLite file
+
+    The Streamlit page enqueues jobs and polls their events; run_worker.py claims
+    jobs one at a time, appends output as events and records the outcome. Workers
+    heartbeat so the page can tell whether anyone is consuming the queue, and jobs
+    held by a worker that stopped heartbeating are put back on the queue.
+
+    Each job's `log_offset` is the ID of its latest output event, so a page
+    following many jobs can tell from one `list_jobs` query which ones have new
+    output and only fetch events for those. The complete output also goes to the
+    job's `log_path` file, so the page only needs to keep recent lines.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            topic TEXT NOT NULL,
+            analysis_depth TEXT NOT NULL,
+            options TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL DEFAULT 'queued',
+            worker_id TEXT,
+            post_id TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            log_offset INTEGER NOT NULL DEFAULT 0,
+            log_path TEXT,
+            run_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+        CREATE TABLE IF NOT EXISTS job_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            text TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, id);
+        CREATE TABLE IF NOT EXISTS workers (
+            id TEXT PRIMARY KEY,
+            pid INTEGER,
+            started_at REAL NOT NULL,
+            heartbeat_at REAL NOT NULL,
+            job_id TEXT
+        );
+    """
+    # Columns added after the first release, created on open for older queue files
+    MIGRATIONS = {
+        "log_offset": "ALTER TABLE jobs ADD COLUMN log_offset INTEGER NOT NULL DEFAULT 0",
+        "log_path": "ALTER TABLE jobs ADD COLUMN log_path TEXT",
+        "run_id": "ALTER TABLE jobs ADD COLUMN run_id TEXT",
+    }
+    # A worker that hasn't heartbeated for this long is considered gone
+    WORKER_TIMEOUT_SECONDS = 30
+
+    def __init__(self, path: Union[str, Path], log_dir: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: Queue database shared by the app and the workers
+            log_dir: Where job log files go, defaulting to a job-logs folder next to the queue
+        """
+        self.path = str(path)
+        self.log_dir = Path(log_dir) if log_dir else Path(self.path).parent / "job-logs"
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, statement in self.MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+
+    def _job(self, row) -> Dict:
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        return job
+
+    def enqueue(self, topic: str, analysis_depth: str, options: Optional[Dict] = None) -> str:
+        """Add a generation job and return its ID"""
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, topic, analysis_depth, options, created_at, log_path) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, topic, analysis_depth, json.dumps(options or {}), time.time(),
+                 str(self.log_dir / f"{job_id}.log"))
+            )
+        self.add_event(job_id, "status", "queued")
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Take the oldest queued job for a worker, or None if the queue is empty
+
+        A job gets its checkpoint run ID on its first claim and keeps it, so a job
+        requeued from a stopped worker resumes that run instead of starting over.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', worker_id = ?, started_at = ?, "
+                        "run_id = COALESCE(run_id, ?) WHERE id = ?",
+                        (worker_id, time.time(), new_run_id(), row["id"])
+                    )
+                    self._conn.execute("UPDATE workers SET job_id = ? WHERE id = ?", (row["id"], worker_id))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        self.add_event(row["id"], "status", "running")
+        return self.get_job(row["id"])
+
+    def complete(self, job_id: str, post_id: Optional[str]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'completed', post_id = ?, finished_at = ? WHERE id = ?",
+                (post_id, time.time(), job_id)
+            )
+            self._conn.execute("UPDATE workers SET job_id = NULL WHERE job_id = ?", (job_id,))
+        self.add_event(job_id, "status", "completed")
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                (error, time.time(), job_id)
+            )
+            self._conn.execute("UPDATE workers SET job_id = NULL WHERE job_id = ?", (job_id,))
+        self.add_event(job_id, "status", "failed")
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def list_jobs(self, limit: int = 20, statuses: Optional[List[str]] = None) -> List[Dict]:
+        """Most recent jobs first, optionally only those in the given statuses"""
+        query = "SELECT * FROM jobs"
+        params: List = []
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (*params, limit)).fetchall()
+        return [self._job(row) for row in rows]
+
+    def queue_position(self, job_id: str) -> int:
+        """How many queued jobs are ahead of this one"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' "
+                "AND created_at < (SELECT created_at FROM jobs WHERE id = ?)",
+                (job_id,)
+            ).fetchone()[0]
+
+    def add_event(self, job_id: str, kind: str, text: str):
+        """Append a progress event; kind is 'output' for log text or 'status' for state changes"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO job_events (job_id, kind, text, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, kind, text, time.time())
+            )
+            if kind == "output":
+                self._conn.execute("UPDATE jobs SET log_offset = ? WHERE id = ?", (cursor.lastrowid, job_id))
+
+    def events(self, job_id: str, after_id: int = 0) -> List[Dict]:
+        """Events for a job newer than `after_id`, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, text, created_at FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+                (job_id, after_id)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def heartbeat(self, worker_id: str, pid: Optional[int] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workers (id, pid, started_at, heartbeat_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (worker_id, pid, now, now)
+            )
+
+    def remove_worker(self, worker_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def active_workers(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM workers WHERE heartbeat_at > ?", (time.time() - self.WORKER_TIMEOUT_SECONDS,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue_abandoned(self) -> int:
+        """Put jobs held by workers that stopped heartbeating back on the queue
+
+        Returns:
+            Number of jobs requeued
+        """
+        cutoff = time.time() - self.WORKER_TIMEOUT_SECONDS
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'running' AND (worker_id IS NULL OR worker_id NOT IN "
+                    "(SELECT id FROM workers WHERE heartbeat_at > ?))",
+                    (cutoff,)
+                ).fetchall()
+                for row in rows:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'queued', worker_id = NULL, started_at = NULL WHERE id = ?",
+                        (row["id"],)
+                    )
+                self._conn.execute("DELETE FROM workers WHERE heartbeat_at <= ?", (cutoff,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        for row in rows:
+            self.add_event(row["id"], "status", "queued")
+        return len(rows)
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue stored at BLOG_JOB_QUEUE_PATH, logging to BLOG_JOB_LOG_DIR"""
+    global _default_queue
+    if _default_queue is None:
+        with _default_queue_lock:
+            if _default_queue is None:
+                _default_queue = JobQueue(
+                    get_setting("BLOG_JOB_QUEUE_PATH", str(ROOT_DIR / ".cache" / "jobs.db")),
+                    log_dir=get_setting("BLOG_JOB_LOG_DIR", str(ROOT_DIR / "runs" / "jobs"))
+                )
+    return _default_queue
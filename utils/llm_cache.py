@@ -0,0 +1,232 @@
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from utils.backends import ROOT_DIR, get_setting
+from utils.rate_limit import get_llm_rate_limiter
+
+class LLMCache:
+    """Content-addressed cache of LLM responses in a SQLite file
+
+    The key is a SHA-256 over model, system prompt, messages, temperature and
+    max_tokens, so any change to the request is a different entry. Entries expire
+    after a TTL and the least recently used are evicted past `max_entries`.
+    Whether a call is cached at all follows `policy`: "auto" only caches
+    temperature=0 calls (the only ones that are meant to be repeatable), "all"
+    caches every call and "off" disables the cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            key TEXT PRIMARY KEY,
+            model TEXT,
+            response BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used);
+    """
+    POLICIES = ("auto", "all", "off")
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        policy: str = "auto",
+        ttl_seconds: float = 7 * 86400.0,
+        max_entries: int = 1000
+    ):
+        """
+        Args:
+            path: Cache file, or ":memory:" for a throwaway cache
+            policy: "auto", "all" or "off"
+            ttl_seconds: How long a response can be reused
+            max_entries: Most responses kept before the least recently used are evicted
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"LLM cache policy must be one of {', '.join(self.POLICIES)}")
+        self.path = str(path)
+        self.policy = policy
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, system: Any, messages: Any, temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """Hash the parts of a request that determine its response"""
+        payload = json.dumps(
+            {"model": model, "system": system, "messages": messages,
+             "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def should_cache(self, temperature: Optional[float]) -> bool:
+        if self.policy == "off":
+            return False
+        return self.policy == "all" or not temperature
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, response: Any, model: Optional[str] = None):
+        now = time.time()
+        data = zlib.compress(json.dumps(response, separators=(",", ":"), default=str).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, data, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def summary(self) -> str:
+        """One line for the generation log"""
+        stats = self.stats()
+        return (f"🧠 LLM cache ({stats['policy']}): {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['entries']} entries")
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM cache configured by the BLOG_LLM_CACHE* settings"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache(
+                    get_setting("BLOG_LLM_CACHE_PATH", str(ROOT_DIR / ".cache" / "llm_responses.db")),
+                    policy=get_setting("BLOG_LLM_CACHE", "auto"),
+                    ttl_seconds=float(get_setting("BLOG_LLM_CACHE_TTL_SECONDS", str(7 * 86400))),
+                    max_entries=int(get_setting("BLOG_LLM_CACHE_MAX_ENTRIES", "1000"))
+                )
+    return _default_cache
+
+def cached_messages_create(client, cache: Optional[LLMCache] = None, **kwargs):
+    """Call `client.messages.create(**kwargs)` through the LLM cache
+
+    Cached responses are rebuilt as anthropic Message objects, so callers can use
+    the result exactly like a live response.
+    """
+    from anthropic.types import Message
+
+    cache = cache or get_llm_cache()
+    if not cache.should_cache(kwargs.get("temperature")):
+        get_llm_rate_limiter().acquire()
+        return client.messages.create(**kwargs)
+
+    key = cache.make_key(
+        kwargs.get("model"), kwargs.get("system"), kwargs.get("messages"),
+        kwargs.get("temperature"), kwargs.get("max_tokens")
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return Message.model_validate(cached)
+
+    get_llm_rate_limiter().acquire()
+    response = client.messages.create(**kwargs)
+    cache.set(key, response.model_dump(mode="json"), model=kwargs.get("model"))
+    return response
+
+def _task_request(task, llm_config: Dict) -> Dict:
+    """The prompt that decides an agent task's output: the agent's persona, the task and its context"""
+    agent = task.agent
+    context: List[str] = []
+    for item in task.context or []:
+        result = getattr(item, "result", None)
+        context.append(result.raw if result is not None else str(item))
+    return {
+        "model": llm_config.get("model"),
+        "system": [agent.name, agent.role, agent.goal, agent.backstory],
+        "messages": [task.description, task.expected_output, context],
+        "temperature": llm_config.get("temperature"),
+        "max_tokens": llm_config.get("max_tokens"),
+    }
+
+def cached_task_runner(
+    run_task: Callable,
+    llm_config: Union[Dict, Callable[[Any], Dict]],
+    cache: Optional[LLMCache] = None,
+    request_for: Optional[Callable[[Any], Optional[Dict]]] = None
+) -> Callable:
+    """Wrap a TaskScheduler task runner so agent task outputs are reused for identical requests
+
+    A hit fills in the task result without calling the model. Agent tasks run at
+    the llm_config temperature, so they are only cached under the "all" policy
+    unless that temperature is 0. `llm_config` can also be a function returning
+    the config for a given task, when stages use different budgets.
+
+    `request_for` returns the exact request (model, system, messages, temperature,
+    max_tokens) a task will send, for tasks the runner calls the model for
+    directly. Keying on it means a change to anything sent, such as system blocks
+    or cache markers, misses the cache. Tasks it returns None for, and every task
+    when it isn't given, are keyed on the agent and task as the framework sees them.
+    """
+    cache = cache or get_llm_cache()
+    config_for = llm_config if callable(llm_config) else (lambda task: llm_config)
+
+    def run(task):
+        llm_config = config_for(task)
+        temperature = llm_config.get("temperature")
+        if not cache.should_cache(temperature):
+            return run_task(task)
+
+        from praisonaiagents.main import TaskOutput
+
+        request = request_for(task) if request_for else None
+        key = cache.make_key(**(request or _task_request(task, llm_config)))
+        cached = cache.get(key)
+        if cached is not None:
+            print(f"🧠 Reusing cached output for task '{task.name}'", flush=True)
+            task.result = TaskOutput(description=task.description, raw=cached, agent=task.agent.name)
+            task.status = "completed"
+            return
+
+        run_task(task)
+        if task.result is not None and task.result.raw:
+            cache.set(key, task.result.raw, model=llm_config.get("model"))
+
+    return run
@@ -0,0 +1,100 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Union
+
+from utils.backends import ROOT_DIR, get_setting
+
+class RateLimiter:
+    """Sliding-window rate limit shared by every process using the same SQLite file
+
+    Each acquire() records a call; once `max_calls` calls fall inside the last
+    `period` seconds, acquire() sleeps until the oldest one leaves the window.
+    Batch generations run in separate processes, so the window lives in SQLite
+    rather than in memory. A `max_calls` of 0 disables the limit.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limit_calls (
+            name TEXT NOT NULL,
+            called_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_rate_limit_calls ON rate_limit_calls (name, called_at);
+    """
+
+    def __init__(self, path: Union[str, Path], name: str = "llm", max_calls: int = 0, period: float = 60.0):
+        """
+        Args:
+            path: SQLite file shared by the processes being limited
+            name: Which limit this is, so several can share a file
+            max_calls: Calls allowed per period; 0 for no limit
+            period: Window length in seconds
+        """
+        self.path = str(path)
+        self.name = name
+        self.max_calls = max_calls
+        self.period = period
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so the limiter can be created before a process pool forks
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def acquire(self) -> float:
+        """Wait for a slot in the window and take it
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.max_calls:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(
+                        "DELETE FROM rate_limit_calls WHERE name = ? AND called_at <= ?",
+                        (self.name, now - self.period)
+                    )
+                    count, oldest = conn.execute(
+                        "SELECT COUNT(*), MIN(called_at) FROM rate_limit_calls WHERE name = ?", (self.name,)
+                    ).fetchone()
+                    if count < self.max_calls:
+                        conn.execute(
+                            "INSERT INTO rate_limit_calls (name, called_at) VALUES (?, ?)", (self.name, now)
+                        )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            if count < self.max_calls:
+                return waited
+            delay = max(oldest + self.period - now, 0.05)
+            time.sleep(delay)
+            waited += delay
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+def get_llm_rate_limiter() -> RateLimiter:
+    """Get the LLM call limiter configured by BLOG_LLM_RATE_LIMIT_PER_MINUTE (0 or unset: no limit)"""
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter(
+                    get_setting("BLOG_RATE_LIMIT_PATH", str(ROOT_DIR / ".cache" / "rate_limit.db")),
+                    name="llm",
+                    max_calls=int(get_setting("BLOG_LLM_RATE_LIMIT_PER_MINUTE", "0") or 0),
+                    period=60.0
+                )
+    return _default_limiter
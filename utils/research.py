@@ -0,0 +1,180 @@
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from pydantic import BaseModel
+
+from utils.depth_profiles import get_depth_profile
+
+MAX_SEARCH_WORKERS = 4
+
+# Used when the planner call fails; ordered so the first N still cover the basics
+FALLBACK_ANGLES = [
+    "What is {query} and why does it matter?",
+    "How are people actually using {query} in practice?",
+    "What are the common pitfalls and limitations of {query}?",
+    "What are the latest developments in {query}?",
+    "How do you get started with {query}?",
+]
+
+# Query parameters that only track where a click came from: any utm_* key, plus these exact keys
+TRACKING_PARAM_PREFIX = "utm_"
+TRACKING_PARAMS = frozenset({"ref", "fbclid", "gclid"})
+
+def is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key.startswith(TRACKING_PARAM_PREFIX) or key in TRACKING_PARAMS
+
+class ResearchSource(BaseModel):
+    """One deduplicated search result and the sub-questions it came up for"""
+    title: str
+    url: str
+    snippet: str = ""
+    questions: List[int] = []
+
+class ResearchBrief(BaseModel):
+    """Merged results of the sub-question searches"""
+    query: str
+    questions: List[str]
+    sources: List[ResearchSource]
+    failed_searches: int = 0
+
+    def to_markdown(self) -> str:
+        """Format the brief for the research task's prompt"""
+        lines = [f"# Research brief: {self.query}", ""]
+        for number, question in enumerate(self.questions, 1):
+            lines.append(f"## Q{number}: {question}")
+            refs = [index for index, source in enumerate(self.sources, 1) if number in source.questions]
+            for index in refs:
+                source = self.sources[index - 1]
+                lines.append(f"- [{index}] {source.title}: {source.snippet}")
+            if not refs:
+                lines.append("- No results found")
+            lines.append("")
+        lines.append("## Sources")
+        for index, source in enumerate(self.sources, 1):
+            lines.append(f"[{index}] {source.title} - {source.url}")
+        return "\n".join(lines)
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to a key that treats http/https, www., trailing slashes and tracking params as the same page"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not is_tracking_param(key)
+    ))
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+def plan_sub_questions(query: str, count: int, api_key: Optional[str] = None, model: str = "claude-3-5-sonnet-20241022") -> List[str]:
+    """Break a topic into `count` focused search questions
+
+    Asks the model for the questions and falls back to fixed angles on the topic
+    if the call fails or returns something unusable.
+    """
+    try:
+        from anthropic import Anthropic
+        from utils.llm_cache import cached_messages_create
+
+        client = Anthropic(api_key=api_key) if api_key else Anthropic()
+        response = cached_messages_create(
+            client,
+            model=model,
+            max_tokens=400,
+            temperature=0,
+            system="You plan web research. Reply with ONLY a JSON array of strings.",
+            messages=[{
+                "role": "user",
+                "content": f"Write {count} distinct web search queries that together cover the practical, "
+                           f"real-world side of this topic, with no overlap: {query}"
+            }]
+        )
+        text = response.content[0].text
+        questions = json.loads(text[text.index("["):text.rindex("]") + 1])
+        questions = [str(question).strip() for question in questions if str(question).strip()]
+        if len(questions) >= count:
+            return questions[:count]
+    except Exception as e:
+        print(f"⚠️ Sub-question planning failed, using default angles: {str(e)}", flush=True)
+    return [angle.format(query=query) for angle in FALLBACK_ANGLES[:count]]
+
+def default_search(query: str) -> List[Dict]:
+    """Search DuckDuckGo through the on-disk search cache, like the research agent's tool"""
+    from utils.search_cache import duckduckgo
+
+    return duckduckgo(query)
+
+def merge_results(query: str, questions: List[str], results: List[List[Dict]]) -> ResearchBrief:
+    """Merge per-question search results into one brief, keeping each page once"""
+    sources: Dict[str, ResearchSource] = {}
+    failed = 0
+    for number, hits in enumerate(results, 1):
+        if not hits or all("error" in hit for hit in hits):
+            failed += 1
+            continue
+        for hit in hits:
+            url = hit.get("url") or hit.get("href")
+            if "error" in hit or not url:
+                continue
+            key = normalize_url(url)
+            source = sources.get(key)
+            if source is None:
+                sources[key] = ResearchSource(
+                    title=hit.get("title") or url,
+                    url=url,
+                    snippet=re.sub(r"\s+", " ", hit.get("snippet") or hit.get("body") or "").strip(),
+                    questions=[number]
+                )
+            else:
+                if number not in source.questions:
+                    source.questions.append(number)
+                # Keep the longer snippet of the two
+                snippet = re.sub(r"\s+", " ", hit.get("snippet") or hit.get("body") or "").strip()
+                if len(snippet) > len(source.snippet):
+                    source.snippet = snippet
+    # Pages that answered several questions first
+    ordered = sorted(sources.values(), key=lambda source: -len(source.questions))
+    return ResearchBrief(query=query, questions=questions, sources=ordered, failed_searches=failed)
+
+def gather_research(
+    query: str,
+    analysis_depth: str,
+    api_key: Optional[str] = None,
+    search: Callable[[str], List[Dict]] = default_search,
+    max_workers: int = MAX_SEARCH_WORKERS
+) -> ResearchBrief:
+    """Research a topic by searching its sub-questions concurrently
+
+    Args:
+        query: The blog topic
+        analysis_depth: "Basic", "Detailed" or "Comprehensive"; its profile sets how many sub-questions to research
+        api_key: Anthropic API key for planning the sub-questions
+        search: Function that takes a query and returns dicts with title, url and snippet
+        max_workers: Maximum searches in flight at once
+
+    Returns:
+        ResearchBrief with the deduplicated sources for every sub-question
+    """
+    count = get_depth_profile(analysis_depth).sub_questions
+    questions = plan_sub_questions(query, count, api_key)
+    print(f"🔎 Researching {len(questions)} sub-questions in parallel...", flush=True)
+
+    def run_search(question: str) -> List[Dict]:
+        try:
+            return search(question)
+        except Exception as e:
+            print(f"⚠️ Search failed for '{question}': {str(e)}", flush=True)
+            return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(questions))) as executor:
+        results = list(executor.map(run_search, questions))
+
+    brief = merge_results(query, questions, results)
+    total = sum(len(hits) for hits in results)
+    print(f"📚 Merged {total} results into {len(brief.sources)} unique sources", flush=True)
+    return brief
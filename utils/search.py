@@ -0,0 +1,348 @@
+import re
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union, Iterable
+
+from utils.backends import PostBackend, ROOT_DIR, get_setting
+
+# Columns the index needs from the posts table
+INDEX_COLUMNS = [
+    "id", "title", "description", "content", "tags", "type",
+    "thumbnail", "published", "created_at", "updated_at"
+]
+
+class PostSearchIndex:
+    """Full-text search over post title, description, content and tags using SQLite FTS5
+
+    The index lives in its own SQLite file next to the app and is kept current
+    incrementally: DatabaseClient and BlogPostDB upsert/remove posts as they write
+    them, so queries never rebuild anything. Writes made elsewhere (the Supabase
+    dashboard, another deployment, a replica sync) are picked up by a staleness
+    check at most every `refresh_seconds`, which pulls posts changed since the
+    index's newest updated_at. Results are ranked with BM25, with title matches
+    weighted highest, and carry highlighted snippets.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS post_docs (
+            rowid INTEGER PRIMARY KEY,
+            id TEXT UNIQUE NOT NULL,
+            type TEXT,
+            thumbnail TEXT,
+            tags TEXT NOT NULL DEFAULT '[]',
+            published INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5(
+            title, description, content, tags,
+            tokenize = 'porter unicode61'
+        );
+        CREATE TABLE IF NOT EXISTS post_tags (
+            tag TEXT NOT NULL,
+            post_rowid INTEGER NOT NULL,
+            PRIMARY KEY (tag, post_rowid)
+        );
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    # BM25 column weights for title, description, content, tags
+    RANK_WEIGHTS = (10.0, 4.0, 1.0, 6.0)
+    BUILD_PAGE_SIZE = 500
+
+    def __init__(self, path: Union[str, Path] = ":memory:", refresh_seconds: float = 60.0):
+        """Open (and create if needed) the index database
+
+        Args:
+            path: Index file, or ":memory:" for a throwaway index
+            refresh_seconds: How often ensure_built checks the backend for changes
+                made outside this process; 0 checks on every call
+        """
+        self.path = str(path)
+        self.refresh_seconds = refresh_seconds
+        self._checked_at: Dict[str, float] = {}
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def build_match_query(text: str) -> Optional[str]:
+        """Turn free text into a safe FTS5 query; every word must match, the last as a prefix"""
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return None
+        terms = [f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*']
+        return " AND ".join(terms)
+
+    def built_for(self) -> Optional[str]:
+        """Get the identity of the backend the index was last fully built from, if any"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'backend'").fetchone()
+        return row[0] if row else None
+
+    def ensure_built(self, backend: PostBackend):
+        """Build the index from the backend if it was built from another one, else refresh it if due"""
+        if self.built_for() != backend.identity:
+            self.rebuild(backend)
+        elif time.monotonic() - self._checked_at.get(backend.identity, float("-inf")) >= self.refresh_seconds:
+            self.refresh(backend)
+
+    def _fetch_all(self, backend: PostBackend) -> List[Dict]:
+        """Page through every post; stops on an empty page so a server row cap can't end it early"""
+        posts = []
+        cursor = None
+        while True:
+            page = backend.list_posts(columns=INDEX_COLUMNS, limit=self.BUILD_PAGE_SIZE, cursor=cursor)
+            if not page:
+                return posts
+            posts.extend(page)
+            cursor = (page[-1]["created_at"], page[-1]["id"])
+
+    def rebuild(self, backend: PostBackend) -> int:
+        """Re-index every post from the backend
+
+        Rows are fetched before the write transaction starts, so the index is
+        only locked for the local writes, not for the network round trips.
+
+        Returns:
+            Number of posts indexed
+        """
+        posts = self._fetch_all(backend)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM post_docs")
+                self._conn.execute("DELETE FROM post_fts")
+                self._conn.execute("DELETE FROM post_tags")
+                for post in posts:
+                    self._upsert(post)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO index_state (key, value) VALUES ('backend', ?)", (backend.identity,)
+                )
+                self._bump_version()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._checked_at[backend.identity] = time.monotonic()
+        return len(posts)
+
+    def refresh(self, backend: PostBackend) -> int:
+        """Pick up posts written to the backend outside this process
+
+        Posts changed since the newest indexed updated_at are fetched from the
+        change feed and upserted. If the post counts still differ afterwards,
+        posts were deleted elsewhere (or rows were missed) and the index is rebuilt.
+
+        Returns:
+            Number of posts re-indexed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at, id FROM post_docs WHERE updated_at IS NOT NULL "
+                "ORDER BY updated_at DESC, id DESC LIMIT 1"
+            ).fetchone()
+        changed = []
+        if row:
+            position = (row["updated_at"], row["id"])
+            while True:
+                page = backend.list_changed_posts(position, columns=INDEX_COLUMNS, limit=self.BUILD_PAGE_SIZE)
+                if not page:
+                    break
+                changed.extend(page)
+                position = (page[-1]["updated_at"], page[-1]["id"])
+        self.upsert_posts(changed)
+        self._checked_at[backend.identity] = time.monotonic()
+        if backend.count_posts() != self.count():
+            return self.rebuild(backend)
+        return len(changed)
+
+    def count(self) -> int:
+        """Number of indexed posts"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM post_docs").fetchone()[0]
+
+    def _bump_version(self):
+        """Count a change to the indexed posts; the caller holds the lock inside a transaction"""
+        self._conn.execute(
+            "INSERT INTO index_state (key, value) VALUES ('version', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def version(self) -> int:
+        """Change counter for the indexed posts, shared by every process using the index file
+
+        Lets derived structures (like the topic similarity index) rebuild only
+        when posts were added, changed or removed.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def documents(self) -> List[Dict]:
+        """Every indexed post's text fields, for building derived indexes"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.id, d.tags, d.published, d.created_at, "
+                "f.title AS title, f.description AS description, f.content AS content "
+                "FROM post_docs d JOIN post_fts f ON f.rowid = d.rowid"
+            ).fetchall()
+        documents = []
+        for row in rows:
+            document = dict(row)
+            document["tags"] = json.loads(document["tags"])
+            document["published"] = bool(document["published"])
+            documents.append(document)
+        return documents
+
+    def _upsert(self, post: Dict):
+        """Insert or replace one post; the caller holds the lock"""
+        tags = post.get("tags") or []
+        existing = self._conn.execute("SELECT rowid FROM post_docs WHERE id = ?", (str(post["id"]),)).fetchone()
+        if existing:
+            rowid = existing[0]
+            self._conn.execute("DELETE FROM post_fts WHERE rowid = ?", (rowid,))
+            self._conn.execute("DELETE FROM post_tags WHERE post_rowid = ?", (rowid,))
+            self._conn.execute(
+                "UPDATE post_docs SET type = ?, thumbnail = ?, tags = ?, published = ?, "
+                "created_at = ?, updated_at = ? WHERE rowid = ?",
+                (post.get("type"), post.get("thumbnail"), json.dumps(tags), int(bool(post.get("published"))),
+                 post.get("created_at"), post.get("updated_at"), rowid)
+            )
+        else:
+            rowid = self._conn.execute(
+                "INSERT INTO post_docs (id, type, thumbnail, tags, published, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(post["id"]), post.get("type"), post.get("thumbnail"), json.dumps(tags),
+                 int(bool(post.get("published"))), post.get("created_at"), post.get("updated_at"))
+            ).lastrowid
+        self._conn.execute(
+            "INSERT INTO post_fts (rowid, title, description, content, tags) VALUES (?, ?, ?, ?, ?)",
+            (rowid, post.get("title") or "", post.get("description") or "",
+             post.get("content") or "", " ".join(tags))
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO post_tags (tag, post_rowid) VALUES (?, ?)",
+            [(tag.lower(), rowid) for tag in tags]
+        )
+
+    def upsert_posts(self, posts: Iterable[Dict]):
+        """Index new or changed posts
+
+        Posts missing any indexed column (e.g. partial projections) are skipped,
+        since indexing them would blank out the missing fields.
+        """
+        posts = [post for post in posts if post and all(column in post for column in INDEX_COLUMNS)]
+        if not posts:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for post in posts:
+                    self._upsert(post)
+                self._bump_version()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def remove_posts(self, post_ids: Sequence[str]):
+        """Drop deleted posts from the index"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for post_id in post_ids:
+                    row = self._conn.execute("SELECT rowid FROM post_docs WHERE id = ?", (str(post_id),)).fetchone()
+                    if row:
+                        self._conn.execute("DELETE FROM post_fts WHERE rowid = ?", (row[0],))
+                        self._conn.execute("DELETE FROM post_tags WHERE post_rowid = ?", (row[0],))
+                        self._conn.execute("DELETE FROM post_docs WHERE rowid = ?", (row[0],))
+                self._bump_version()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def search(
+        self,
+        query: str,
+        tags: Optional[Sequence[str]] = None,
+        published: Optional[bool] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """Search posts, best matches first
+
+        Args:
+            query: Free text; every word has to match somewhere in the post
+            tags: Only return posts that have all of these tags
+            published: True for published posts, False for drafts, None for both
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with the post summary fields plus `title_highlight`,
+            `snippet` (content excerpt with **matches** marked) and `rank`
+        """
+        match = self.build_match_query(query)
+        if match is None:
+            return []
+        weights = ", ".join(str(weight) for weight in self.RANK_WEIGHTS)
+        sql = f"""
+            SELECT d.id, d.type, d.thumbnail, d.tags, d.published, d.created_at, d.updated_at,
+                   post_fts.title AS title,
+                   post_fts.description AS description,
+                   highlight(post_fts, 0, '**', '**') AS title_highlight,
+                   snippet(post_fts, 2, '**', '**', '…', 24) AS snippet,
+                   bm25(post_fts, {weights}) AS rank
+            FROM post_fts
+            JOIN post_docs d ON d.rowid = post_fts.rowid
+            WHERE post_fts MATCH ?
+        """
+        params = [match]
+        if published is not None:
+            sql += " AND d.published = ?"
+            params.append(int(published))
+        for tag in tags or []:
+            sql += " AND d.rowid IN (SELECT post_rowid FROM post_tags WHERE tag = ?)"
+            params.append(tag.lower())
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["tags"] = json.loads(result["tags"])
+            result["published"] = bool(result["published"])
+            results.append(result)
+        return results
+
+    def all_tags(self) -> List[str]:
+        """Get every tag in the index, for tag filter pickers"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT tag FROM post_tags ORDER BY tag")]
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_search_index() -> PostSearchIndex:
+    """Get the process-wide search index stored at BLOG_SEARCH_INDEX_PATH, checked for outside
+    changes every BLOG_SEARCH_REFRESH_SECONDS"""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = PostSearchIndex(
+                    get_setting("BLOG_SEARCH_INDEX_PATH", str(ROOT_DIR / ".cache" / "search.db")),
+                    refresh_seconds=float(get_setting("BLOG_SEARCH_REFRESH_SECONDS", "60"))
+                )
+    return _default_index
@@ -0,0 +1,166 @@
+import re
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from utils.backends import ROOT_DIR, get_setting
+
+class SearchCache:
+    """Persistent cache of web search results in a SQLite file
+
+    Entries are keyed by the normalized query, expire after a TTL and are evicted
+    least-recently-used once the cache holds more than `max_entries`. Results are
+    stored as zlib-compressed JSON. Expired entries are kept until evicted so they
+    can still be served when a live search fails, e.g. when rerunning offline.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS search_results (
+            key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            results BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_search_results_last_used ON search_results (last_used);
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", ttl_seconds: float = 86400.0, max_entries: int = 2000):
+        """
+        Args:
+            path: Cache file, or ":memory:" for a throwaway cache
+            ttl_seconds: How long results count as fresh
+            max_entries: Most queries kept before the least recently used are evicted
+        """
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase, collapse whitespace and drop surrounding punctuation so trivial variants share an entry"""
+        return re.sub(r"\s+", " ", query.lower()).strip(" \t\n?!.,;:\"'")
+
+    def get(self, query: str, allow_expired: bool = False) -> Optional[List[Dict]]:
+        """Get cached results for a query, or None if missing or expired"""
+        key = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not allow_expired and now - row[1] > self.ttl_seconds):
+                return None
+            self._conn.execute("UPDATE search_results SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, query: str, results: List[Dict]):
+        """Store results for a query, evicting the least recently used entries past the size cap"""
+        now = time.time()
+        data = zlib.compress(json.dumps(results, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (key, query, results, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.normalize_query(query), query, data, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM search_results WHERE key IN ("
+                "SELECT key FROM search_results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM search_results")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(results)), 0) FROM search_results"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def search(self, query: str, search: Callable[[str], List[Dict]], bypass: bool = False) -> List[Dict]:
+        """Return cached results for the query, calling `search` on a miss
+
+        Args:
+            query: Search query
+            search: The live search function
+            bypass: Skip the cache lookup and fetch fresh results (which are still stored)
+        """
+        if not bypass:
+            cached = self.get(query)
+            if cached is not None:
+                with self._lock:
+                    self.hits += 1
+                return cached
+
+        with self._lock:
+            self.misses += 1
+        results = search(query)
+        if results and not all("error" in result for result in results):
+            self.set(query, results)
+            return results
+
+        # Live search failed; serve what we had, however old
+        stale = self.get(query, allow_expired=True)
+        if stale is not None:
+            with self._lock:
+                self.stale_hits += 1
+            print(f"⚠️ Search failed, using cached results for '{query}'", flush=True)
+            return stale
+        return results
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache configured by the BLOG_SEARCH_CACHE_* settings"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SearchCache(
+                    get_setting("BLOG_SEARCH_CACHE_PATH", str(ROOT_DIR / ".cache" / "search_results.db")),
+                    ttl_seconds=float(get_setting("BLOG_SEARCH_CACHE_TTL_SECONDS", "86400")),
+                    max_entries=int(get_setting("BLOG_SEARCH_CACHE_MAX_ENTRIES", "2000"))
+                )
+    return _default_cache
+
+def search_cache_bypassed() -> bool:
+    """Whether BLOG_SEARCH_CACHE_BYPASS asks for fresh results"""
+    return str(get_setting("BLOG_SEARCH_CACHE_BYPASS", "")).lower() in ("1", "true", "yes")
+
+def duckduckgo(query: str) -> List[Dict]:
+    """Search the web with DuckDuckGo.
+
+    Args:
+        query: Search query string
+
+    Returns:
+        List of search results with title, url, and snippet
+    """
+    from praisonaiagents.tools import duckduckgo as live_duckduckgo
+
+    return get_search_cache().search(query, live_duckduckgo, bypass=search_cache_bypassed())
@@ -0,0 +1,136 @@
+import re
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from utils.backends import get_setting
+from utils.search import PostSearchIndex
+
+# Common words that say nothing about a topic
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could did do does doing
+for from get got had has have how i if in into is it its just let like make more most much my
+new no not now of on one or our out over really so some than that the their them then there
+these they this those to too up us use using very was way we what when where which while who
+why will with would you your yours vs via
+""".split())
+# How much each field counts towards what a post is "about"
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 2.0, "content": 1.0}
+# Only the opening of the content is used; that's where a post states its topic
+CONTENT_WORDS = 300
+
+class TopicMatch(BaseModel):
+    """An existing post that covers a topic"""
+    id: str
+    title: str
+    score: float
+    published: bool
+    created_at: Optional[str] = None
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word stems, without stopwords and very short words"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        # Light stemming so "test", "tests" and "testing" meet
+        for suffix in ("ing", "es", "s"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[: -len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+class TopicIndex:
+    """TF-IDF vectors over existing posts, for spotting a topic that was already written up
+
+    Vectors are built from the text stored in the local full-text search index and
+    rebuilt only when that index's version changes. A lookup is then a few
+    sparse dot products in memory and needs no network or LLM call.
+    """
+
+    def __init__(self, search_index: PostSearchIndex):
+        self.search_index = search_index
+        self._lock = threading.Lock()
+        self._version = None
+        self._documents: List[Dict] = []
+        self._vectors: List[Dict[str, float]] = []
+        self._idf: Dict[str, float] = {}
+        self._default_idf = 1.0
+
+    def _document_terms(self, document: Dict) -> Counter:
+        terms = Counter()
+        fields = {
+            "title": document.get("title"),
+            "tags": " ".join(document.get("tags") or []),
+            "description": document.get("description"),
+            "content": " ".join((document.get("content") or "").split()[:CONTENT_WORDS]),
+        }
+        for field, text in fields.items():
+            for token in tokenize(text):
+                terms[token] += FIELD_WEIGHTS[field]
+        return terms
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        # Sublinear term frequency so a word repeated through a long post doesn't dominate
+        vector = {
+            term: (1 + math.log(count)) * self._idf.get(term, self._default_idf)
+            for term, count in terms.items() if count > 0
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the vectors if the search index changed
+
+        Returns:
+            True if the vectors were rebuilt
+        """
+        version = self.search_index.version()
+        with self._lock:
+            if not force and version == self._version:
+                return False
+            documents = self.search_index.documents()
+            term_counts = [self._document_terms(document) for document in documents]
+            frequency = Counter(term for terms in term_counts for term in terms)
+            total = len(documents)
+            # Smoothed IDF; terms the corpus has never seen get the highest weight
+            self._idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in frequency.items()}
+            self._default_idf = math.log(1 + total) + 1
+            self._documents = documents
+            self._vectors = [self._vector(terms) for terms in term_counts]
+            self._version = version
+        return True
+
+    def similar(self, topic: str, limit: int = 3, threshold: float = 0.0) -> List[TopicMatch]:
+        """Existing posts most similar to a topic, best first
+
+        Args:
+            topic: The topic about to be generated
+            limit: Maximum number of matches
+            threshold: Minimum cosine similarity (0 to 1) for a match
+        """
+        self.refresh()
+        terms = Counter(tokenize(topic))
+        if not terms:
+            return []
+        with self._lock:
+            query = self._vector(terms)
+            scored = []
+            for document, vector in zip(self._documents, self._vectors):
+                score = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+                if score >= threshold and score > 0:
+                    scored.append((score, document))
+        scored.sort(key=lambda item: -item[0])
+        return [
+            TopicMatch(id=str(document["id"]), title=document.get("title") or "", score=round(score, 3),
+                       published=document.get("published", False), created_at=document.get("created_at"))
+            for score, document in scored[:limit]
+        ]
+
+def duplicate_threshold() -> float:
+    """Similarity above which a topic counts as already covered (BLOG_DUPLICATE_THRESHOLD)"""
+    return float(get_setting("BLOG_DUPLICATE_THRESHOLD", "0.3"))
@@ -0,0 +1,125 @@
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+def task_prompt(task, skip_context: Iterable[str] = ()) -> Dict[str, str]:
+    """Build the system prompt and user message for running an agent task directly
+
+    Mirrors what the agent framework sends: the agent's persona as the system
+    prompt, and the task description, expected output and the results of the
+    tasks in its context as the message.
+
+    Args:
+        task: praisonaiagents Task
+        skip_context: Names of context tasks whose results the caller sends
+            elsewhere (in a cached system block) and should not be repeated here
+    """
+    agent = task.agent
+    system = (
+        f"You are {agent.name}, {agent.role}.\n"
+        f"Your goal: {agent.goal}\n"
+        f"Your background: {agent.backstory}"
+    )
+    context: List[str] = []
+    for item in task.context or []:
+        if getattr(item, "name", None) in skip_context:
+            continue
+        result = getattr(item, "result", None)
+        if result is not None and result.raw:
+            context.append(result.raw)
+    message = f"{task.description}\n\nExpected Output: {task.expected_output}"
+    if context:
+        message += "\n\nContext:\n\n" + "\n\n".join(context)
+    return {"system": system, "message": message}
+
+def task_request(task, llm_config: Dict, system: Optional[List[Dict]] = None, skip_context: Iterable[str] = ()) -> Dict[str, Any]:
+    """The Messages API request stream_task and complete_task send for a task"""
+    prompt = task_prompt(task, skip_context)
+    return {
+        "model": llm_config["model"],
+        "max_tokens": llm_config.get("max_tokens", 4096),
+        "temperature": llm_config.get("temperature", 0.7),
+        "system": system if system is not None else prompt["system"],
+        "messages": [{"role": "user", "content": prompt["message"]}],
+    }
+
+def _complete(task, raw: str):
+    from praisonaiagents.main import TaskOutput
+
+    task.result = TaskOutput(description=task.description, raw=raw, agent=task.agent.name)
+    task.status = "completed"
+
+def stream_task(
+    task,
+    llm_config: Dict,
+    write: Optional[Callable[[str], None]] = None,
+    system: Optional[List[Dict]] = None,
+    skip_context: Iterable[str] = ()
+):
+    """Run an agent task with a streaming Claude call, writing tokens as they arrive
+
+    The task's result is filled in the same way the agent framework would, so
+    downstream code can keep reading `task.result.raw`.
+
+    Args:
+        task: praisonaiagents Task whose context tasks have finished
+        llm_config: The model, api_key, temperature and max_tokens the agents use
+        write: Called with each text chunk. Defaults to writing to stdout unbuffered.
+        system: System prompt blocks to send instead of the agent's persona
+        skip_context: Context task names already included in `system`
+
+    Returns:
+        The final anthropic Message, with the token usage of the call
+    """
+    from anthropic import Anthropic
+
+    if write is None:
+        def write(text):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    client = Anthropic(api_key=llm_config.get("api_key"))
+    parts = []
+    print(f"\n✍️ Streaming '{task.name}'...\n", flush=True)
+    with client.messages.stream(**task_request(task, llm_config, system, skip_context)) as stream:
+        for text in stream.text_stream:
+            parts.append(text)
+            write(text)
+        message = stream.get_final_message()
+    write("\n")
+
+    _complete(task, "".join(parts))
+    return message
+
+def complete_task(task, llm_config: Dict, system: Optional[List[Dict]] = None, skip_context: Iterable[str] = ()):
+    """Run an agent task with a single non-streaming Claude call
+
+    Used for stages that need no tools, so the request (and its prompt cache
+    breakpoints) is exactly what we build rather than what the agent framework sends.
+
+    Returns:
+        The anthropic Message, with the token usage of the call
+    """
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=llm_config.get("api_key"))
+    print(f"🤖 Running '{task.name}'...", flush=True)
+    message = client.messages.create(**task_request(task, llm_config, system, skip_context))
+    _complete(task, "".join(block.text for block in message.content if block.type == "text"))
+    return message
+
+def message_usage(message) -> Dict[str, Any]:
+    """Token counts of a Claude call, with prompt-cache reads and writes broken out
+
+    `input_tokens` is the whole prompt, cached or not, so runs with and without
+    prompt caching compare directly.
+    """
+    usage = message.usage
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    return {
+        "input_tokens": usage.input_tokens + cache_write + cache_read,
+        "output_tokens": usage.output_tokens,
+        "cache_write_tokens": cache_write,
+        "cache_read_tokens": cache_read,
+        "estimated": False
+    }
@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+# The voice every post is written in. Sent once per call as the first system
+# block instead of being repeated in each task description.
+STYLE_GUIDE = """STYLE GUIDE - follow this in everything you write:
+- Write like we're having a coffee chat--- casual but clear
+- Use dashes (---) to break up thoughts and add emphasis
+- CAPITALIZE things when they're exciting or important
+- Share the learning experience--- no expert claims, just real experiences
+- Keep it practical--- theory is cool but what can we actually DO with this?
+- Be honest about what you're still figuring out
+- Connect ideas in unexpected ways
+- Break rules when it feels natural
+- Mix short, punchy statements with longer explanations
+- Make things ACTUALLY useful--- no fluff
+- Share interesting tangents and what worked, what didn't, what surprised you
+- Keep it real--- we're all learning here
+- Make it feel like friends chatting about tech
+
+WORD CHOICE:
+- Use "explore" not "dive into"
+- Use "improve" not "enhance"
+- Use "find" not "discover"
+- Use "show" not "unveil"
+- Use "complete" not "comprehensive"
+- Use "ask" not "inquire"
+- Use "experience" not "journey"
+- Use "use" not "leverage/utilize"
+- Use "help" not "facilitate"
+- Use "explain" not "elucidate"
+- Use "combine" not "synthesize"
+- Use "speed up" not "expedite"
+- Use "develop" not "cultivate"
+- Use "express" not "articulate"
+- Use "spread" not "proliferate"
+- Use "increase" not "augment"
+- Use "show" not "manifest"
+- Use "examine" not "scrutinize"
+- Use "confirm" not "validate"
+"""
+
+def style_system(persona: str, shared: str = "", cache: bool = True) -> List[Dict]:
+    """System prompt blocks for a stage: the style guide and shared material, then the persona
+
+    The style guide and any material several stages read (the research findings)
+    come first and carry the cache breakpoint, so the cached prefix is identical
+    for every agent. Anthropic only caches prefixes of 1024+ tokens on Sonnet;
+    shorter prefixes are sent normally.
+
+    Args:
+        persona: The agent's own system prompt
+        shared: Text every later stage sends, appended to the style guide
+        cache: Mark the shared block for prompt caching. Only worth it when a
+            later call will read the same prefix, since cache writes cost 25% more.
+    """
+    block = {"type": "text", "text": STYLE_GUIDE + (f"\n{shared}" if shared else "")}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return [block, {"type": "text", "text": persona}]
+
+def with_style_guide(description: str) -> str:
+    """A task description with the style guide inlined, for stages run by the agent framework"""
+    return f"{description}\n\n{STYLE_GUIDE}"
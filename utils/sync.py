@@ -0,0 +1,209 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from utils.backends import PostBackend, SQLiteBackend, ROOT_DIR, get_setting
+
+# Position before every row; ids are UUIDs in Postgres so the id part has to be one too
+START_POSITION = ("1970-01-01T00:00:00+00:00", "00000000-0000-0000-0000-000000000000")
+
+class SyncReport(BaseModel):
+    """What one sync run fetched, applied and transferred"""
+    rows_fetched: int = 0
+    rows_upserted: int = 0
+    rows_deleted: int = 0
+    requests: int = 0
+    bytes_transferred: int = 0
+    seconds: float = 0.0
+    full_id_check: bool = False
+    watermark: Optional[str] = None
+
+class PostReplicaSync:
+    """Keeps a local SQLite replica of the posts table up to date incrementally
+
+    Each sync pulls only rows whose (updated_at, id) is past the stored watermark,
+    so a run where nothing changed costs a single small request. Deletes leave no
+    trace in the change feed, so every `id_check_every` syncs (or on request) the
+    replica's ids are diffed against the source's id column and missing rows dropped.
+    """
+    # Kept at or below PostgREST's max-rows (1000 by default) so a short page really is the end
+    PAGE_SIZE = 500
+    # Re-read this much before the watermark to catch rows committed late with an older updated_at
+    OVERLAP_SECONDS = 5
+
+    def __init__(self, source: PostBackend, replica: SQLiteBackend, id_check_every: int = 10):
+        """
+        Args:
+            source: Backend to copy from, normally Supabase
+            replica: Local SQLite backend to copy into
+            id_check_every: Run the id-set diff for deletes every this many syncs
+        """
+        self.source = source
+        self.replica = replica
+        self.id_check_every = id_check_every
+
+    def get_watermark(self) -> Optional[str]:
+        """Get the updated_at of the newest row applied to the replica"""
+        return self.replica.get_meta("sync_watermark")
+
+    def _start_position(self):
+        watermark = self.get_watermark()
+        if not watermark:
+            return START_POSITION
+        start = datetime.fromisoformat(watermark) - timedelta(seconds=self.OVERLAP_SECONDS)
+        return (start.isoformat(), START_POSITION[1])
+
+    def sync(self, full_id_check: bool = False) -> SyncReport:
+        """Pull changed rows into the replica and, periodically, drop deleted ones
+
+        Args:
+            full_id_check: Run the id-set diff for deletes on this sync regardless of schedule
+
+        Returns:
+            SyncReport with row counts, bytes transferred and the new watermark
+        """
+        started = time.perf_counter()
+        report = SyncReport()
+
+        position = self._start_position()
+        watermark = self.get_watermark()
+        while True:
+            rows = self.source.list_changed_posts(position, limit=self.PAGE_SIZE)
+            report.requests += 1
+            report.bytes_transferred += len(json.dumps(rows, default=str).encode("utf-8"))
+            if rows:
+                report.rows_fetched += len(rows)
+                report.rows_upserted += self.replica.upsert_posts(rows)
+                position = (rows[-1]["updated_at"], rows[-1]["id"])
+                newest = SQLiteBackend.normalize_timestamp(rows[-1]["updated_at"])
+                if not watermark or newest > watermark:
+                    watermark = newest
+                    self.replica.set_meta("sync_watermark", watermark)
+            if len(rows) < self.PAGE_SIZE:
+                break
+
+        sync_count = int(self.replica.get_meta("sync_count") or 0) + 1
+        self.replica.set_meta("sync_count", str(sync_count))
+        if full_id_check or sync_count % self.id_check_every == 1 or self.id_check_every == 1:
+            report.full_id_check = True
+            report.rows_deleted = self._drop_deleted(report)
+
+        self.replica.set_meta("last_sync_at", datetime.now(timezone.utc).isoformat())
+        report.watermark = watermark
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _drop_deleted(self, report: SyncReport) -> int:
+        """Delete replica rows whose ids no longer exist in the source
+
+        Pages stay at PAGE_SIZE, under PostgREST's max-rows cap, and the scan only
+        stops on an empty page, so a capped response can't end it early. If the ids
+        seen don't add up to the source's row count (rows added or removed mid-scan),
+        nothing is deleted and the next id check tries again.
+        """
+        expected = self.source.count_posts()
+        report.requests += 1
+        source_ids = set()
+        cursor = None
+        while True:
+            rows = self.source.list_posts(columns=["id", "created_at"], limit=self.PAGE_SIZE, cursor=cursor)
+            report.requests += 1
+            report.bytes_transferred += len(json.dumps(rows, default=str).encode("utf-8"))
+            if not rows:
+                break
+            source_ids.update(str(row["id"]) for row in rows)
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+        if len(source_ids) != expected:
+            print(f"⚠️ Id check saw {len(source_ids)} posts but the source counts {expected}; "
+                  f"skipping deletes this sync", flush=True)
+            return 0
+        deleted = [post_id for post_id in self.replica.all_ids() if post_id not in source_ids]
+        if deleted:
+            self.replica.delete_posts(deleted)
+        return len(deleted)
+
+class ReplicaBackend(PostBackend):
+    """Serves reads from the local replica and sends every write to the source
+
+    Selected with BLOG_BACKEND = "replica". Listings, counts and single-post reads
+    hit the SQLite replica kept current by run_sync.py, so they cost no round trip.
+    Inserts, updates, media appends, deletes and storage go to the source (Supabase),
+    and the rows they return are applied to the replica straight away, so a page
+    reads its own writes without waiting for the next sync.
+    """
+    name = "replica"
+
+    def __init__(self, source: PostBackend, replica: SQLiteBackend):
+        self.source = source
+        self.replica = replica
+
+    @property
+    def identity(self) -> str:
+        return f"{self.name}:{self.source.identity}"
+
+    @property
+    def client(self):
+        """The source's Supabase client"""
+        return self.source.client
+
+    def _apply(self, rows: List[Dict]) -> List[Dict]:
+        rows = [row for row in rows if row]
+        self.replica.upsert_posts(rows)
+        return rows
+
+    def list_posts(self, columns=None, published=None, order_by="created_at", limit=None, cursor=None):
+        return self.replica.list_posts(columns, published, order_by, limit, cursor)
+
+    def list_changed_posts(self, after, columns=None, limit=500):
+        return self.replica.list_changed_posts(after, columns, limit)
+
+    def count_posts(self, published=None):
+        return self.replica.count_posts(published)
+
+    def get_post(self, post_id, columns=None):
+        return self.replica.get_post(post_id, columns)
+
+    def insert_posts(self, rows):
+        return self._apply(self.source.insert_posts(rows))
+
+    def update_posts(self, post_ids, updates, if_updated_at=None):
+        return self._apply(self.source.update_posts(post_ids, updates, if_updated_at=if_updated_at))
+
+    def delete_posts(self, post_ids: Sequence[str]):
+        deleted = self.source.delete_posts(post_ids)
+        self.replica.delete_posts(post_ids)
+        return deleted
+
+    def append_media(self, post_id, media):
+        post = self.source.append_media(post_id, media)
+        self._apply([post])
+        return post
+
+    def check_connection(self):
+        self.source.check_connection()
+
+    def upload_file(self, bucket, path, file, file_options=None):
+        return self.source.upload_file(bucket, path, file, file_options)
+
+    def remove_files(self, bucket, paths):
+        return self.source.remove_files(bucket, paths)
+
+    def list_files(self, bucket, folder, limit=None):
+        return self.source.list_files(bucket, folder, limit)
+
+    def get_public_url(self, bucket, path):
+        return self.source.get_public_url(bucket, path)
+
+    def create_signed_url(self, bucket, path, expires_in):
+        return self.source.create_signed_url(bucket, path, expires_in)
+
+def get_replica() -> SQLiteBackend:
+    """Open the local replica at BLOG_REPLICA_PATH"""
+    return SQLiteBackend(
+        get_setting("BLOG_REPLICA_PATH", str(ROOT_DIR / ".cache" / "replica.db")),
+        get_setting("BLOG_STORAGE_DIR", str(ROOT_DIR / ".cache" / "storage"))
+    )
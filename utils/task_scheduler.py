@@ -0,0 +1,159 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+class TaskTiming(BaseModel):
+    """When one task ran, in seconds since the scheduler started"""
+    name: str
+    depends_on: List[str] = []
+    start: Optional[float] = None
+    end: Optional[float] = None
+    status: str = "pending"  # pending, running, completed, failed or skipped
+
+    @property
+    def seconds(self) -> float:
+        return (self.end - self.start) if self.start is not None and self.end is not None else 0.0
+
+def run_single_task(task) -> None:
+    """Run one praisonaiagents Task through its own single-task workflow
+
+    Tasks in `task.context` have already finished by the time this runs, so the
+    workflow picks up their results as context as usual.
+    """
+    from praisonaiagents import PraisonAIAgents
+
+    PraisonAIAgents(agents=[task.agent], tasks=[task], process="sequential", verbose=True).start()
+
+class TaskScheduler:
+    """Runs praisonaiagents Tasks as a DAG built from their `context=[...]` dependencies
+
+    Every task starts as soon as all the tasks in its context have completed, so
+    independent tasks run concurrently instead of back to back. Per-task start and
+    end times are recorded so the wall-clock saving over a sequential run can be shown.
+    """
+
+    def __init__(
+        self,
+        tasks: Sequence,
+        max_workers: Optional[int] = None,
+        run_task: Callable = run_single_task
+    ):
+        """
+        Args:
+            tasks: Tasks to run; dependencies are the Task objects in each task's context
+            max_workers: Maximum tasks running at once. Defaults to one per task.
+            run_task: Callable that runs one task and sets its result
+        """
+        self.tasks = list(tasks)
+        self.max_workers = max_workers or len(self.tasks) or 1
+        self.run_task = run_task
+        self.dependencies = {
+            task.name: [dep.name for dep in (task.context or []) if any(dep is other for other in self.tasks)]
+            for task in self.tasks
+        }
+        self.timings: Dict[str, TaskTiming] = {
+            task.name: TaskTiming(name=task.name, depends_on=self.dependencies[task.name])
+            for task in self.tasks
+        }
+        self._check_acyclic()
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    def _check_acyclic(self):
+        """Raise ValueError if the context dependencies loop back on themselves"""
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Task dependencies form a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _run(self, task):
+        with self._lock:
+            timing = self.timings[task.name]
+            timing.start = time.perf_counter() - self._started_at
+            timing.status = "running"
+        print(f"▶️ Starting task '{task.name}' at +{timing.start:.1f}s", flush=True)
+        try:
+            self.run_task(task)
+        finally:
+            with self._lock:
+                timing.end = time.perf_counter() - self._started_at
+        print(f"⏹️ Finished task '{task.name}' at +{timing.end:.1f}s ({timing.seconds:.1f}s)", flush=True)
+
+    def run(self) -> List[TaskTiming]:
+        """Run every task, each as soon as its dependencies are done
+
+        If a task fails, no new tasks are started, the running ones are allowed to
+        finish and the first error is raised.
+
+        Returns:
+            Timings for every task in the order they were passed in
+        """
+        self._started_at = time.perf_counter()
+        by_name = {task.name: task for task in self.tasks}
+        done = set()
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if error is None:
+                    for name, deps in self.dependencies.items():
+                        if (self.timings[name].status == "pending" and name not in running
+                                and all(dep in done for dep in deps)):
+                            running[executor.submit(self._run, by_name[name])] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        self.timings[name].status = "completed"
+                        done.add(name)
+                    except Exception as e:
+                        self.timings[name].status = "failed"
+                        error = error or Exception(f"Error running task {name}: {str(e)}")
+
+        for timing in self.timings.values():
+            if timing.status == "pending":
+                timing.status = "skipped"
+        if error:
+            raise error
+        return list(self.timings.values())
+
+    def wall_clock_seconds(self) -> float:
+        """Time from the first task starting to the last one ending"""
+        ends = [timing.end for timing in self.timings.values() if timing.end is not None]
+        return max(ends) if ends else 0.0
+
+    def sequential_seconds(self) -> float:
+        """What the same task durations add up to when run back to back"""
+        return sum(timing.seconds for timing in self.timings.values())
+
+    def report(self) -> str:
+        """Format a per-task timeline with the saving over a sequential run"""
+        lines = ["⏱️ Task timeline:"]
+        for timing in sorted(self.timings.values(), key=lambda t: (t.start is None, t.start or 0)):
+            after = f" (after {', '.join(timing.depends_on)})" if timing.depends_on else ""
+            if timing.start is None:
+                lines.append(f"   {timing.name:<10} {timing.status}{after}")
+            else:
+                lines.append(
+                    f"   {timing.name:<10} +{timing.start:6.1f}s → +{timing.end:6.1f}s "
+                    f"({timing.seconds:.1f}s, {timing.status}){after}"
+                )
+        wall = self.wall_clock_seconds()
+        sequential = self.sequential_seconds()
+        lines.append(
+            f"   Wall clock {wall:.1f}s vs {sequential:.1f}s sequential "
+            f"(saved {sequential - wall:.1f}s)"
+        )
+        return "\n".join(lines)
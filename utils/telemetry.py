@@ -0,0 +1,152 @@
+import json
+import time
+import functools
+import threading
+import statistics
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+EVENTS_FILE = "events.jsonl"
+# Marks telemetry lines in the generation output so they can be told apart from log text
+EVENT_PREFIX = "📊 "
+
+class Telemetry:
+    """Structured events for one generation run
+
+    Each event is a JSON object with the run ID, event name and timestamp. It is
+    appended to runs/<run_id>/events.jsonl and printed to stdout, so it shows up
+    in the app's terminal and in worker and batch logs too.
+    """
+
+    def __init__(self, run_id: str, path: Union[str, Path], echo: bool = True):
+        """
+        Args:
+            run_id: Run the events belong to
+            path: JSON-lines file to append to
+            echo: Also print each event to stdout
+        """
+        self.run_id = run_id
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.echo = echo
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: defaultdict(int))
+
+    def emit(self, event: str, **fields) -> Dict[str, Any]:
+        record = {"run_id": self.run_id, "event": event, "ts": round(time.time(), 3), **fields}
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        if self.echo:
+            print(EVENT_PREFIX + line, flush=True)
+        return record
+
+    def count(self, stage: str, name: str, amount: int = 1):
+        """Add to a per-stage counter reported with the stage's end event"""
+        with self._lock:
+            self._counters[stage][name] += amount
+
+    def counters(self, stage: str) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters[stage])
+
+    def counted_tool(self, stage: str, tool: Callable) -> Callable:
+        """Wrap an agent tool so each call is counted as a tool call and a search for `stage`
+
+        functools.wraps keeps the name, docstring and signature the agent
+        framework builds the tool schema from.
+        """
+        @functools.wraps(tool)
+        def wrapper(*args, **kwargs):
+            self.count(stage, "tool_calls")
+            self.count(stage, "searches")
+            return tool(*args, **kwargs)
+        return wrapper
+
+def load_events(root: Union[str, Path], last: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Read the events of every run under `root`, optionally only the `last` runs by start time"""
+    paths = sorted(Path(root).glob(f"*/{EVENTS_FILE}"))
+    if last:
+        paths = paths[-last:]
+    events = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A run killed mid-write can leave a partial last line
+                    continue
+    return events
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def summarize(events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate stage_end events into per-stage latency and token statistics
+
+    Stages restored from a checkpoint or served from the LLM cache did no work,
+    so they are left out of the timing and token figures.
+    """
+    stages = defaultdict(list)
+    runs = set()
+    for event in events:
+        runs.add(event.get("run_id"))
+        if event.get("event") == "stage_end" and not event.get("restored") and not event.get("cached"):
+            # Writing with a compressed brief is reported separately to show the difference
+            stage = event["stage"] + (" (compressed)" if event.get("compressed_context") else "")
+            stages[stage].append(event)
+
+    total_seconds = sum(event.get("seconds", 0) for items in stages.values() for event in items) or 1.0
+    total_tokens = sum(
+        event.get("input_tokens", 0) + event.get("output_tokens", 0)
+        for items in stages.values() for event in items
+    ) or 1
+    summary = {}
+    for stage, items in stages.items():
+        seconds = [event.get("seconds", 0) for event in items]
+        input_tokens = [event.get("input_tokens", 0) for event in items]
+        output_tokens = [event.get("output_tokens", 0) for event in items]
+        summary[stage] = {
+            "runs": len(items),
+            "median_seconds": statistics.median(seconds),
+            "p95_seconds": _percentile(seconds, 0.95),
+            "mean_input_tokens": statistics.mean(input_tokens),
+            "mean_output_tokens": statistics.mean(output_tokens),
+            "mean_searches": statistics.mean(event.get("searches", 0) for event in items),
+            "mean_tool_calls": statistics.mean(event.get("tool_calls", 0) for event in items),
+            "time_share": sum(seconds) / total_seconds,
+            "token_share": (sum(input_tokens) + sum(output_tokens)) / total_tokens,
+            "estimated": any(event.get("estimated") for event in items),
+        }
+    return {"runs": len(runs), "stages": summary}
+
+def format_report(summary: Dict[str, Any]) -> str:
+    """Render a summary as a text table with the stages that dominate time and tokens"""
+    stages = summary["stages"]
+    if not stages:
+        return "No stage telemetry found."
+    width = max(10, *(len(name) for name in stages))
+    lines = [
+        f"📊 Stage telemetry over {summary['runs']} runs",
+        f"{'stage':<{width}} {'runs':>5} {'median s':>9} {'p95 s':>7} {'in tok':>8} {'out tok':>8} "
+        f"{'searches':>9} {'time %':>7} {'token %':>8}",
+    ]
+    for name, stage in sorted(stages.items(), key=lambda item: -item[1]["time_share"]):
+        lines.append(
+            f"{name:<{width}} {stage['runs']:>5} {stage['median_seconds']:>9.1f} {stage['p95_seconds']:>7.1f} "
+            f"{stage['mean_input_tokens']:>8,.0f} {stage['mean_output_tokens']:>8,.0f} "
+            f"{stage['mean_searches']:>9.1f} {stage['time_share']:>7.0%} {stage['token_share']:>8.0%}"
+            + ("  (tokens estimated)" if stage["estimated"] else "")
+        )
+    slowest = max(stages, key=lambda name: stages[name]["time_share"])
+    costliest = max(stages, key=lambda name: stages[name]["token_share"])
+    lines.append(f"⏱️ Most time: {slowest} ({stages[slowest]['time_share']:.0%})   "
+                 f"🔢 Most tokens: {costliest} ({stages[costliest]['token_share']:.0%})")
+    return "\n".join(lines)